@@ -2,7 +2,8 @@
 AI module for OpenAI integration.
 """
 
-from .ai_client import ai_client
+from .ai_client import get_ai_client
+from .caching_client import get_caching_client
 from .prompt_builder import prompt_builder
 
-__all__ = ['ai_client', 'prompt_builder']
+__all__ = ['get_ai_client', 'get_caching_client', 'prompt_builder']
@@ -6,14 +6,71 @@ Provides a clean interface for generating AI content.
 
 import httpx
 from app.config import settings
-from typing import Optional, Dict, Any
-import json
+from app.ai.cache import llm_cache, LLMCache, DETERMINISTIC_TEMPERATURE
+from app.ai.json_stream import JsonArrayStreamParser
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Callable, Awaitable, AsyncIterator
+import asyncio
 import logging
+import orjson
+import random
 import re
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Rate-limited and transient server-side failures are worth retrying
+_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Network errors raised before the request reached Gemini, so a retry can't
+# run a generation twice (read timeouts may have been processed already)
+_RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Gemini endpoints that are only available on v1beta
+_V1BETA_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+# Precompiled helpers for JSON cleanup
+_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+_JSON_START_RE = re.compile(r'[{\[]')
+_QUOTE_TRANSLATE = str.maketrans({
+    "\u201c": '"',
+    "\u201d": '"',
+    "\u2018": "'",
+    "\u2019": "'",
+})
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """
+    Remove commas that are directly followed (ignoring whitespace) by } or ].
+    
+    Jumps between commas with str.find, so only the characters right after
+    each comma are inspected in Python.
+    
+    Args:
+        text: JSON-like text
+        
+    Returns:
+        str: Text without trailing commas
+    """
+    pieces = []
+    start = 0
+    length = len(text)
+    comma = text.find(',')
+    while comma != -1:
+        nxt = comma + 1
+        while nxt < length and text[nxt] in ' \t\r\n':
+            nxt += 1
+        if nxt < length and text[nxt] in '}]':
+            pieces.append(text[start:comma])
+            start = comma + 1
+        comma = text.find(',', nxt)
+    
+    if not pieces:
+        return text
+    pieces.append(text[start:])
+    return ''.join(pieces)
+
 
 class AIClient:
     """
@@ -26,15 +83,40 @@ class AIClient:
         self.model_name = settings.GEMINI_MODEL
         self.max_tokens = settings.GEMINI_MAX_TOKENS
         self.temperature = settings.GEMINI_TEMPERATURE
+        self.cache = llm_cache
+        # Futures for requests currently on the wire, keyed like the cache
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._inflight_lock = asyncio.Lock()
         # Correct endpoint format for Gemini API v1 (not v1beta)
         self.base_url = f"https://generativelanguage.googleapis.com/v1/models/{self.model_name}:generateContent"
-        logger.info(f"✅ AI Client initialized with model: {self.model_name}")
+        # Full request URL never changes after construction
+        self._url = f"{self.base_url}?key={self.api_key}"
+        self._stream_url = (
+            f"https://generativelanguage.googleapis.com/v1/models/{self.model_name}"
+            f":streamGenerateContent?alt=sse&key={self.api_key}"
+        )
+        self._headers = {"content-type": "application/json"}
+        self.embedding_model = settings.GEMINI_EMBEDDING_MODEL
+        self._embed_url = (
+            f"{_V1BETA_URL}/models/{self.embedding_model}:embedContent?key={self.api_key}"
+        )
+        self._batch_url = (
+            f"{_V1BETA_URL}/models/{self.model_name}:batchGenerateContent?key={self.api_key}"
+        )
+        # Cap outbound concurrency so bursts queue locally instead of hitting 429s
+        self._sem = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+        self._max_attempts = max(1, settings.GEMINI_MAX_ATTEMPTS)
+        self._max_retry_delay = settings.GEMINI_RETRY_MAX_DELAY
+        # Shared connection pool, opened inside the running event loop
+        self._client: Optional[httpx.AsyncClient] = None
+        logger.info("✅ AI Client initialized with model: %s", self.model_name)
     
     async def generate_completion(
         self,
         prompt: str,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        response_mime_type: Optional[str] = None
     ) -> str:
         """
         Generate a completion from Google Gemini API using REST.
@@ -43,6 +125,7 @@ class AIClient:
             prompt: The prompt to send to the AI
             temperature: Randomness (0.0-1.0). Higher = more creative
             max_tokens: Maximum response length
+            response_mime_type: Output MIME type to enforce (e.g. "application/json")
             
         Returns:
             str: Generated text response
@@ -50,68 +133,336 @@ class AIClient:
         Raises:
             Exception: If API call fails
         """
+        temperature = self.temperature if temperature is None else temperature
+        max_tokens = max_tokens or self.max_tokens
+        
+        key = LLMCache.make_key(
+            self.model_name, prompt, temperature, max_tokens,
+            response_mime_type=response_mime_type
+        )
+        deterministic = temperature <= DETERMINISTIC_TEMPERATURE
+        
+        # Only deterministic calls are safe to serve from cache
+        if deterministic:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                logger.info("⚡ Serving Gemini completion from cache")
+                return cached
+        
+        text = await self._single_flight(
+            key,
+            lambda: self._request_completion(prompt, temperature, max_tokens, response_mime_type)
+        )
+        if deterministic:
+            await self.cache.set(key, text)
+        return text
+    
+    async def _single_flight(self, key: str, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run coro_factory() once per key for all concurrent callers.
+        
+        The first caller for a key does the work; everyone arriving while it
+        is in flight awaits the same future instead of repeating the call.
+        
+        Args:
+            key: Identity of the request (a cache key)
+            coro_factory: Zero-argument callable returning the awaitable to run
+            
+        Returns:
+            The result shared by every caller for this key
+            
+        Raises:
+            Exception: Whatever the owning call raised
+        """
+        async with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+        
+        if not is_owner:
+            logger.info("🔗 Joining in-flight Gemini request")
+            return await asyncio.shield(future)
+        
+        try:
+            result = await coro_factory()
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            async with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    async def _request_completion(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        response_mime_type: Optional[str] = None
+    ) -> str:
+        """
+        Send a single generateContent request to Gemini.
+        
+        Args:
+            prompt: The prompt to send to the AI
+            temperature: Effective temperature
+            max_tokens: Effective maximum response length
+            response_mime_type: Output MIME type to enforce, if any
+            
+        Returns:
+            str: Generated text response
+            
+        Raises:
+            httpx.RequestError: If the request could not reach Gemini
+            Exception: If Gemini returns an error or an unexpected payload
+        """
+        payload = self._build_payload(prompt, temperature, max_tokens, response_mime_type)
+        
+        logger.info("🔄 Calling Gemini API: %s", self.model_name)
+        logger.debug("Prompt length: %d chars", len(prompt))
+        
         try:
-            url = f"{self.base_url}?key={self.api_key}"
-            
-            payload = {
-                "contents": [{
-                    "parts": [{
-                        "text": prompt
-                    }]
-                }],
-                "generationConfig": {
-                    "temperature": temperature or self.temperature,
-                    "maxOutputTokens": max_tokens or self.max_tokens,
-                }
+            response = await self._post_with_retry(orjson.dumps(payload))
+        except httpx.RequestError as e:
+            # Network failures propagate as-is so callers keep the original traceback
+            logger.error("❌ Request Error: %s", e)
+            raise
+        
+        # Log response status
+        logger.info("📡 Gemini API Response Status: %d", response.status_code)
+        
+        # Handle non-200 responses
+        if response.status_code != 200:
+            error_detail = response.text
+            logger.error("❌ Gemini API Error (%d): %s", response.status_code, error_detail)
+            raise Exception(f"Gemini API returned {response.status_code}: {error_detail}")
+        
+        # Parse the raw bytes directly (skips the separate UTF-8 decode)
+        text = self._extract_text(orjson.loads(response.content))
+        logger.info("✅ Successfully generated %d chars from Gemini", len(text))
+        return text
+    
+    @staticmethod
+    def _build_payload(
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        response_mime_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build a generateContent request body.
+        
+        Args:
+            prompt: The prompt to send to the AI
+            temperature: Effective temperature
+            max_tokens: Effective maximum response length
+            response_mime_type: Output MIME type to enforce, if any
+            
+        Returns:
+            dict: Request body
+        """
+        payload = {
+            "contents": [{
+                "parts": [{
+                    "text": prompt
+                }]
+            }],
+            "generationConfig": {
+                "temperature": temperature,
+                "maxOutputTokens": max_tokens,
             }
+        }
+        if response_mime_type:
+            payload["generationConfig"]["responseMimeType"] = response_mime_type
+        return payload
+    
+    @staticmethod
+    def _extract_text(data: Dict[str, Any]) -> str:
+        """
+        Pull the generated text out of a generateContent response.
+        
+        Args:
+            data: Parsed generateContent response
             
-            logger.info(f"🔄 Calling Gemini API: {self.model_name}")
-            logger.debug(f"Prompt length: {len(prompt)} chars")
+        Returns:
+            str: Generated text
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, json=payload)
-                
-                # Log response status
-                logger.info(f"📡 Gemini API Response Status: {response.status_code}")
-                
-                # Handle non-200 responses
-                if response.status_code != 200:
-                    error_detail = response.text
-                    logger.error(f"❌ Gemini API Error ({response.status_code}): {error_detail}")
-                    raise Exception(f"Gemini API returned {response.status_code}: {error_detail}")
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                # Extract text from response
-                if "candidates" in data and len(data["candidates"]) > 0:
-                    candidate = data["candidates"][0]
-                    if "content" in candidate and "parts" in candidate["content"]:
-                        text = candidate["content"]["parts"][0]["text"]
-                        logger.info(f"✅ Successfully generated {len(text)} chars from Gemini")
-                        return text.strip()
-                
-                logger.error("❌ No valid response structure from Gemini API")
-                raise Exception("No valid response from Gemini API")
+        Raises:
+            Exception: If the response has no candidate text
+        """
+        if "candidates" in data and len(data["candidates"]) > 0:
+            candidate = data["candidates"][0]
+            if "content" in candidate and "parts" in candidate["content"]:
+                return candidate["content"]["parts"][0]["text"].strip()
+        
+        logger.error("❌ No valid response structure from Gemini API")
+        raise Exception("No valid response from Gemini API")
+    
+    async def _post_with_retry(
+        self,
+        body: bytes,
+        url: Optional[str] = None,
+        retry: bool = True
+    ) -> httpx.Response:
+        """
+        POST a request body to Gemini under the concurrency limit.
+        
+        429/5xx responses and connection failures are retried with
+        exponential backoff and jitter, honouring Retry-After when Gemini
+        sends it. Backoff sleeps happen outside the semaphore so waiting
+        requests don't hold a slot.
+        
+        Args:
+            body: Serialized JSON request body
+            url: Endpoint to call (defaults to generateContent)
+            retry: Set False for requests that must not be sent twice
             
-        except httpx.HTTPStatusError as e:
-            logger.error(f"❌ HTTP Status Error: {e.response.status_code} - {e.response.text}")
-            raise Exception(f"Google Gemini API HTTP Error: {str(e)}")
-        except httpx.RequestError as e:
-            logger.error(f"❌ Request Error: {str(e)}")
-            raise Exception(f"Network error calling Gemini API: {str(e)}")
-        except Exception as e:
-            logger.error(f"❌ Unexpected error: {str(e)}")
-            raise Exception(f"Google Gemini API Error: {str(e)}")
+        Returns:
+            httpx.Response: The final response (possibly still an error)
+            
+        Raises:
+            httpx.TransportError: If the last attempt fails at the network level
+        """
+        attempts = self._max_attempts if retry else 1
+        last_attempt = attempts - 1
+        for attempt in range(attempts):
+            try:
+                async with self._sem:
+                    response = await self._http().post(
+                        url or self._url,
+                        content=body,
+                        headers=self._headers
+                    )
+            except _RETRY_EXCEPTIONS as e:
+                if attempt == last_attempt:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.warning(
+                    "⏳ Gemini request failed (%s), retrying in %.2fs (attempt %d/%d)",
+                    e, delay, attempt + 1, attempts
+                )
+                await asyncio.sleep(delay)
+                continue
+            
+            if response.status_code not in _RETRY_STATUS_CODES or attempt == last_attempt:
+                return response
+            
+            delay = self._retry_delay(attempt, response.headers.get("retry-after"))
+            logger.warning(
+                "⏳ Gemini returned %d, retrying in %.2fs (attempt %d/%d)",
+                response.status_code, delay, attempt + 1, attempts
+            )
+            await asyncio.sleep(delay)
+        
+        return response
+    
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Seconds to wait before the next attempt.
+        
+        Args:
+            attempt: Zero-based number of the attempt that just failed
+            retry_after: Retry-After header value, if the server sent one
+            
+        Returns:
+            float: Delay, capped at GEMINI_RETRY_MAX_DELAY
+        """
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self._max_retry_delay)
+            except ValueError:
+                # HTTP-date form; fall back to our own backoff
+                pass
+        return min(2 ** attempt + random.random(), self._max_retry_delay)
+    
+    async def embed_text(self, text: str) -> List[float]:
+        """
+        Compute an embedding vector for a piece of text.
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            list: Embedding values
+            
+        Raises:
+            Exception: If the embedding call fails
+        """
+        payload = {
+            "model": f"models/{self.embedding_model}",
+            "content": {
+                "parts": [{
+                    "text": text
+                }]
+            }
+        }
+        response = await self._post_with_retry(orjson.dumps(payload), url=self._embed_url)
+        if response.status_code != 200:
+            raise Exception(f"Gemini embedding API returned {response.status_code}: {response.text}")
+        return orjson.loads(response.content)["embedding"]["values"]
     
     async def generate_structured_json(
         self,
         prompt: str,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        validate: Optional[Callable[[Any], None]] = None
     ) -> Dict[Any, Any]:
         """
         Generate structured JSON response from Gemini.
         
+        Args:
+            prompt: The prompt requesting JSON output
+            temperature: Randomness level
+            validate: Optional check that raises on a malformed response;
+                runs before the response is cached
+            
+        Returns:
+            dict: Parsed JSON response
+            
+        Raises:
+            Exception: If API call fails or JSON parsing fails
+        """
+        # Deterministic calls cache the parsed dict so repeats skip extraction too
+        effective_temperature = self.temperature if temperature is None else temperature
+        key = LLMCache.make_key(
+            self.model_name, prompt, effective_temperature, self.max_tokens, kind="json"
+        )
+        deterministic = effective_temperature <= DETERMINISTIC_TEMPERATURE
+        if deterministic:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                logger.info("⚡ Serving structured JSON from cache")
+                return cached
+        
+        async def generate() -> Dict[Any, Any]:
+            data = await self._generate_and_parse_json(prompt, temperature)
+            if validate is not None:
+                validate(data)
+            return data
+        
+        # Concurrent identical requests share one call and one parse
+        parsed_data = await self._single_flight(key, generate)
+        if deterministic:
+            await self.cache.set(key, parsed_data)
+        return parsed_data
+    
+    async def _generate_and_parse_json(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None
+    ) -> Dict[Any, Any]:
+        """
+        Request JSON output from Gemini and parse it.
+        
         Args:
             prompt: The prompt requesting JSON output
             temperature: Randomness level
@@ -128,30 +479,250 @@ class AIClient:
             
             logger.info("🔄 Generating structured JSON response")
             
-            # Get completion
-            response = await self.generate_completion(
-                prompt=json_prompt,
-                temperature=temperature
+            # Get completion; Gemini enforces pure JSON output (no fences or prose).
+            # Bypasses the text cache: the caller caches the parsed dict instead
+            response = await self._request_completion(
+                json_prompt,
+                self.temperature if temperature is None else temperature,
+                self.max_tokens,
+                "application/json"
             )
             
-            logger.debug(f"Raw response preview: {response[:200]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw response preview: %s...", response[:200])
             
-            # Clean and extract JSON from response
-            response = self._extract_json(response)
+            parsed_data = self.parse_json(response)
             
-            # Parse the JSON
-            parsed_data = json.loads(response)
-            logger.info(f"✅ Successfully parsed JSON response")
+            logger.info("✅ Successfully parsed JSON response")
             return parsed_data
             
-        except json.JSONDecodeError as e:
-            logger.error(f"❌ JSON Parse Error: {str(e)}")
-            logger.error(f"Response was: {response[:500] if len(response) > 500 else response}")
+        except orjson.JSONDecodeError as e:
+            logger.error("❌ JSON Parse Error: %s", e)
+            logger.error("Response was: %s", response[:500])
             raise Exception(f"Failed to parse AI response as JSON: {str(e)}")
         except Exception as e:
-            logger.error(f"❌ Error in generate_structured_json: {str(e)}")
+            logger.error("❌ Error in generate_structured_json: %s", e)
             raise Exception(f"AI generation error: {str(e)}")
     
+    async def stream_structured_json(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        field: str = "questions"
+    ) -> AsyncIterator[Any]:
+        """
+        Stream the items of a JSON response's array field as they are generated.
+        
+        For a response shaped like {"questions": [...]} (or a bare array),
+        each question is yielded as soon as the model finishes writing it.
+        
+        Args:
+            prompt: The prompt requesting JSON output
+            temperature: Randomness level
+            field: Name of the array field whose items are streamed
+            
+        Yields:
+            Each completed item of the response's top-level array field
+            
+        Raises:
+            Exception: If the API call fails, the output is not valid JSON
+                or it contains no array items
+        """
+        temperature = self.temperature if temperature is None else temperature
+        json_prompt = f"{prompt}\n\nIMPORTANT: Return ONLY valid JSON, no additional text."
+        payload = self._build_payload(json_prompt, temperature, self.max_tokens, "application/json")
+        parser = JsonArrayStreamParser(field)
+        yielded = 0
+        
+        logger.info("🔄 Streaming structured JSON from Gemini: %s", self.model_name)
+        
+        async with self._sem:
+            async with self._http().stream(
+                "POST",
+                self._stream_url,
+                content=orjson.dumps(payload),
+                headers=self._headers
+            ) as response:
+                if response.status_code != 200:
+                    error_detail = (await response.aread()).decode("utf-8", "replace")
+                    logger.error("❌ Gemini API Error (%d): %s", response.status_code, error_detail)
+                    raise Exception(f"Gemini API returned {response.status_code}: {error_detail}")
+                
+                # Server-sent events: each "data:" line is a partial generateContent response
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    chunk = orjson.loads(line[5:])
+                    for candidate in chunk.get("candidates", [])[:1]:
+                        for part in candidate.get("content", {}).get("parts", []):
+                            for item in parser.feed(part.get("text", "")):
+                                yielded += 1
+                                yield item
+        
+        # An unexpected shape would otherwise end the stream silently
+        if yielded == 0:
+            raise Exception("Gemini stream ended without any array items")
+    
+    def parse_json(self, response: str) -> Dict[Any, Any]:
+        """
+        Parse model output as JSON, cleaning it up only if needed.
+        
+        Args:
+            response: Raw AI response text
+            
+        Returns:
+            dict: Parsed JSON
+            
+        Raises:
+            orjson.JSONDecodeError: If the text is not valid JSON even after cleanup
+        """
+        # JSON mode output parses directly; the cleanup below is only a safety net
+        try:
+            return orjson.loads(response)
+        except orjson.JSONDecodeError:
+            # Clean and extract JSON from response, then parse again
+            return orjson.loads(self._extract_json(response))
+    
+    async def submit_batch(
+        self,
+        prompts: List[str],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        response_mime_type: Optional[str] = None,
+        display_name: str = "codecore-batch"
+    ) -> str:
+        """
+        Submit prompts to the Gemini Batch API.
+        
+        Batch jobs are billed at a discount but complete asynchronously,
+        so they suit bulk work that nobody is waiting on interactively.
+        
+        Args:
+            prompts: Prompts to generate, one request each
+            temperature: Randomness level applied to every prompt
+            max_tokens: Maximum response length applied to every prompt
+            response_mime_type: Output MIME type to enforce, if any
+            display_name: Human-readable job name
+            
+        Returns:
+            str: Batch job name (e.g. "batches/abc123")
+            
+        Raises:
+            Exception: If Gemini rejects the job
+        """
+        temperature = self.temperature if temperature is None else temperature
+        max_tokens = max_tokens or self.max_tokens
+        
+        payload = {
+            "batch": {
+                "display_name": display_name,
+                "input_config": {
+                    "requests": {
+                        "requests": [
+                            {
+                                "request": self._build_payload(
+                                    prompt, temperature, max_tokens, response_mime_type
+                                ),
+                                "metadata": {"key": str(index)}
+                            }
+                            for index, prompt in enumerate(prompts)
+                        ]
+                    }
+                }
+            }
+        }
+        
+        logger.info("📦 Submitting Gemini batch of %d requests", len(prompts))
+        # Not retried: a resend after a lost response would submit (and bill)
+        # a second batch job
+        response = await self._post_with_retry(
+            orjson.dumps(payload), url=self._batch_url, retry=False
+        )
+        if response.status_code != 200:
+            raise Exception(f"Gemini batch API returned {response.status_code}: {response.text}")
+        
+        data = orjson.loads(response.content)
+        job_id = data.get("name") or data.get("metadata", {}).get("name")
+        if not job_id:
+            raise Exception("Gemini batch API did not return a job name")
+        
+        logger.info("📦 Gemini batch submitted: %s", job_id)
+        return job_id
+    
+    async def poll_batch(self, job_id: str) -> Dict[str, Any]:
+        """
+        Fetch the current state of a batch job.
+        
+        Args:
+            job_id: Batch job name from submit_batch()
+            
+        Returns:
+            dict: "state" (e.g. "PENDING", "RUNNING", "SUCCEEDED", "FAILED"),
+                "done" flag and the raw "operation" payload
+            
+        Raises:
+            Exception: If the job cannot be fetched
+        """
+        response = await self._http().get(
+            f"{_V1BETA_URL}/{job_id}",
+            params={"key": self.api_key}
+        )
+        if response.status_code == 404:
+            raise Exception(f"Batch job not found: {job_id}")
+        if response.status_code != 200:
+            raise Exception(f"Gemini batch API returned {response.status_code}: {response.text}")
+        
+        data = orjson.loads(response.content)
+        state = data.get("metadata", {}).get("state") or data.get("state") or "UNSPECIFIED"
+        # REST reports BATCH_STATE_*, the SDKs JOB_STATE_*; expose the bare name
+        for prefix in ("BATCH_STATE_", "JOB_STATE_"):
+            if state.startswith(prefix):
+                state = state[len(prefix):]
+        
+        done = bool(data.get("done")) or state in ("SUCCEEDED", "FAILED", "CANCELLED", "EXPIRED")
+        return {"state": state, "done": done, "operation": data}
+    
+    async def fetch_batch_results(
+        self,
+        job_id: str,
+        status: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        Collect the generated texts of a finished batch job.
+        
+        Args:
+            job_id: Batch job name from submit_batch()
+            status: Result of a poll_batch() call the caller already made;
+                the job is polled again only when omitted
+            
+        Returns:
+            list: Generated text per request, in submission order
+            
+        Raises:
+            Exception: If the job has not succeeded or any request failed
+        """
+        if status is None:
+            status = await self.poll_batch(job_id)
+        if status["state"] != "SUCCEEDED":
+            raise Exception(f"Batch job {job_id} is {status['state']}, results unavailable")
+        
+        operation = status["operation"]
+        output = operation.get("response") or operation.get("metadata", {}).get("output") or {}
+        inlined = output.get("inlinedResponses", [])
+        if isinstance(inlined, dict):
+            inlined = inlined.get("inlinedResponses", [])
+        
+        # Restore submission order from the per-request keys when present
+        if all("key" in item.get("metadata", {}) for item in inlined):
+            inlined = sorted(inlined, key=lambda item: int(item["metadata"]["key"]))
+        
+        texts = []
+        for item in inlined:
+            if "error" in item:
+                raise Exception(f"Batch request failed: {item['error'].get('message', item['error'])}")
+            texts.append(self._extract_text(item.get("response", {})))
+        return texts
+    
     def _extract_json(self, response: str) -> str:
         """
         Extract JSON from various response formats (markdown, code blocks, etc.)
@@ -165,46 +736,68 @@ class AIClient:
         # Remove leading/trailing whitespace
         response = response.strip()
         
-        # Handle markdown code blocks
-        if "```json" in response:
-            logger.debug("Removing JSON markdown wrapper")
-            # Extract content between ```json and ```
-            parts = response.split("```json")
-            if len(parts) > 1:
-                response = parts[1].split("```")[0].strip()
-        elif "```" in response:
-            logger.debug("Removing generic markdown wrapper")
-            # Extract content between ``` and ```
-            parts = response.split("```")
-            if len(parts) >= 3:
-                response = parts[1].strip()
-        
-        # Remove any text before the first { or [
-        json_start = response.find('{')
-        if json_start == -1:
-            json_start = response.find('[')
-        if json_start > 0:
-            logger.debug(f"Removing {json_start} chars before JSON start")
-            response = response[json_start:]
-        
-        # Remove any text after the last } or ]
-        json_end = response.rfind('}')
-        if json_end == -1:
-            json_end = response.rfind(']')
-        if json_end > 0 and json_end < len(response) - 1:
-            logger.debug(f"Removing {len(response) - json_end - 1} chars after JSON end")
+        # Handle markdown code blocks (```json ... ``` or ``` ... ```)
+        fence = _FENCE_RE.search(response)
+        if fence:
+            logger.debug("Removing markdown code fence")
+            response = fence.group(1)
+        
+        # Remove any text before the first { or [ (scans only the leading prose)
+        json_start = _JSON_START_RE.search(response)
+        if json_start and json_start.start() > 0:
+            logger.debug("Removing %d chars before JSON start", json_start.start())
+            response = response[json_start.start():]
+        
+        # Remove any text after the last bracket closing the opening one; rfind
+        # walks back over the trailing prose only, and matching the opener keeps
+        # brackets of the other kind in that prose (e.g. "see [2]") out of it
+        closer = "}" if response.startswith("{") else "]"
+        json_end = response.rfind(closer)
+        if 0 < json_end < len(response) - 1:
+            logger.debug("Removing %d chars after JSON end", len(response) - json_end - 1)
             response = response[:json_end + 1]
         
         # Fix common JSON issues
-        # Replace smart quotes with regular quotes
-        response = response.replace('"', '"').replace('"', '"')
-        response = response.replace(''', "'").replace(''', "'")
+        # Replace smart quotes with regular quotes (single pass)
+        response = response.translate(_QUOTE_TRANSLATE)
         
         # Remove any trailing commas before closing braces/brackets
-        response = re.sub(r',(\s*[}\]])', r'\1', response)
+        response = _strip_trailing_commas(response)
         
         return response.strip()
     
+    def _http(self) -> httpx.AsyncClient:
+        """
+        Return the pooled HTTP client, creating it on first use.
+        
+        Returns:
+            httpx.AsyncClient: Shared client reused across calls so TCP/TLS
+            handshakes are amortized
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30.0
+                )
+            )
+        return self._client
+    
+    async def startup(self) -> None:
+        """Open the pooled HTTP client from within the application's event loop."""
+        self._http()
+        logger.info("🔌 AI Client connection pool opened")
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client and release its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("🔌 AI Client connection pool closed")
+    
     async def validate_api_key(self) -> bool:
         """
         Validate that the API key is working.
@@ -219,10 +812,19 @@ class AIClient:
             logger.info("✅ API key is valid")
             return True
         except Exception as e:
-            logger.error(f"❌ API key validation failed: {str(e)}")
+            logger.error("❌ API key validation failed: %s", e)
             return False
 
 
-# Create global AI client instance
-ai_client = AIClient()
+@lru_cache(maxsize=1)
+def get_ai_client() -> AIClient:
+    """
+    Return the shared AI client, creating it on first use.
+    
+    Deferring construction keeps settings and logging work out of import time.
+    
+    Returns:
+        AIClient: The process-wide client instance
+    """
+    return AIClient()
 
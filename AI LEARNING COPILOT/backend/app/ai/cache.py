@@ -0,0 +1,134 @@
+"""
+LLM Response Cache
+Content-addressed cache for deterministic Gemini calls.
+Keeps hot entries in an in-process LRU and can optionally persist them to disk.
+"""
+
+from app.config import settings
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+import asyncio
+import hashlib
+import logging
+import orjson
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Temperatures at or below this value are treated as deterministic
+DETERMINISTIC_TEMPERATURE = 0.01
+
+
+class LLMCache:
+    """
+    In-process LRU cache for AI responses, optionally backed by diskcache.
+    """
+
+    def __init__(self, max_entries: int = 256, directory: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            directory: Optional directory for an on-disk diskcache store
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._disk = None
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "disk_hits": 0}
+
+        if directory:
+            try:
+                import diskcache
+                self._disk = diskcache.Cache(directory)
+                logger.info("💾 LLM cache persisted to: %s", directory)
+            except ImportError:
+                logger.warning("diskcache is not installed, using in-memory LLM cache only")
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        kind: str = "text",
+        response_mime_type: Optional[str] = None
+    ) -> str:
+        """
+        Build a content-addressed cache key.
+
+        Args:
+            model: Model name used for the call
+            prompt: Prompt text
+            temperature: Effective temperature
+            max_tokens: Effective max output tokens
+            kind: Type of cached value ("text" or "json")
+            response_mime_type: Output MIME type requested from the model, if any
+
+        Returns:
+            str: SHA-256 hex digest identifying the request
+        """
+        raw = orjson.dumps(
+            {
+                "k": kind,
+                "m": model,
+                "p": prompt,
+                "t": temperature,
+                "mx": max_tokens,
+                "r": response_mime_type
+            },
+            option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.sha256(raw).hexdigest()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return self._entries[key]
+
+        if self._disk is not None:
+            # diskcache is synchronous; keep its file I/O off the event loop
+            value = await asyncio.to_thread(self._disk.get, key)
+            if value is not None:
+                self.stats["disk_hits"] += 1
+                self._store(key, value)
+                return value
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Store a value in the cache.
+
+        Args:
+            key: Cache key from make_key()
+            value: Value to store (must be picklable for the disk backend)
+        """
+        self._store(key, value)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, value)
+
+    def _store(self, key: str, value: Any) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entry if full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Create global cache instance
+llm_cache = LLMCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    directory=settings.LLM_CACHE_DIR
+)
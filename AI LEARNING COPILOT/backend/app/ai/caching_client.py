@@ -0,0 +1,212 @@
+"""
+Caching AI Client
+Wraps AIClient with response caches so repeated or near-duplicate
+requests are answered without a Gemini round-trip.
+"""
+
+from app.config import settings
+from app.ai.ai_client import AIClient, get_ai_client
+from app.ai.local_embedder import LocalEmbedder
+from app.ai.semantic_cache import SemanticCache
+from app.utils.shared_cache import shared_cache
+from functools import lru_cache
+from typing import Optional, Dict, Any, Callable
+import hashlib
+import logging
+import time
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Shared-cache key prefix of semantic entries: llm:semantic:{model id}:{digest},
+# one key (and TTL) per entry
+_SEMANTIC_PREFIX = "llm:semantic:"
+
+
+class CachingAIClient:
+    """
+    AIClient wrapper that consults a semantic cache before calling Gemini.
+    """
+    
+    def __init__(
+        self,
+        client: AIClient,
+        semantic_cache: Optional[SemanticCache] = None,
+        embedder: Optional[LocalEmbedder] = None
+    ):
+        """
+        Initialize the wrapper.
+        
+        Args:
+            client: The underlying Gemini client
+            semantic_cache: Optional embedding-similarity cache
+            embedder: Optional local model for semantic-cache embeddings
+                (defaults to the Gemini embedding API)
+        """
+        self.client = client
+        self.semantic_cache = semantic_cache
+        self.embedder = embedder
+    
+    async def generate_structured_json(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        namespace: str = "default",
+        semantic_text: Optional[str] = None,
+        validate: Optional[Callable[[Any], None]] = None
+    ) -> Dict[Any, Any]:
+        """
+        Generate structured JSON, serving near-duplicates from cache.
+        
+        Args:
+            prompt: The prompt requesting JSON output
+            temperature: Randomness level
+            namespace: Cache partition, so different request types never collide
+            semantic_text: The user-supplied part of the request to compare on.
+                Prompts share a long static prefix, so embedding the full prompt
+                would make every request look alike. None disables the lookup.
+            validate: Optional check that raises on a malformed response, so
+                only well-formed responses reach any cache
+        
+        Returns:
+            dict: Parsed JSON response
+        """
+        if self.semantic_cache is None or not semantic_text:
+            return await self.client.generate_structured_json(
+                prompt, temperature=temperature, validate=validate
+            )
+        
+        # Embeddings of different models are not comparable, so each model
+        # gets its own partitions and shared keys
+        model_id = self.embedding_model_id()
+        partition = f"{model_id}:{namespace}"
+        
+        try:
+            if self.embedder is not None:
+                embedding = await self.embedder.embed(semantic_text)
+            else:
+                embedding = await self.client.embed_text(semantic_text)
+            cached = self.semantic_cache.lookup(partition, embedding)
+        except Exception as e:
+            # The cache is an optimization; never fail a request because of it
+            logger.warning("Semantic cache skipped: %s", e)
+            return await self.client.generate_structured_json(
+                prompt, temperature=temperature, validate=validate
+            )
+        
+        if cached is not None:
+            logger.info("⚡ Serving %s from semantic cache", namespace)
+            return cached
+        
+        response = await self.client.generate_structured_json(
+            prompt, temperature=temperature, validate=validate
+        )
+        try:
+            self.semantic_cache.add(partition, semantic_text, embedding, response)
+        except Exception as e:
+            logger.warning("Semantic cache store failed: %s", e)
+            return response
+        ttl = self.semantic_cache.ttl
+        digest = hashlib.blake2b(
+            f"{namespace}\n{semantic_text}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+        await shared_cache.set(
+            f"{_SEMANTIC_PREFIX}{model_id}:{digest}",
+            {
+                "namespace": partition,
+                "text": semantic_text,
+                "embedding": embedding,
+                "value": response,
+                # Lets warm-up keep the original expiry instead of a fresh TTL
+                "expires_at": time.time() + ttl
+            },
+            ttl=ttl
+        )
+        return response
+    
+    def embedding_model_id(self) -> str:
+        """
+        Identify the model that computes semantic-cache embeddings.
+        
+        Returns:
+            str: "local:<model>" or "gemini:<model>"
+        """
+        if self.embedder is not None:
+            return f"local:{self.embedder.model_name}"
+        return f"gemini:{self.client.embedding_model}"
+    
+    async def start_embedder(self) -> None:
+        """
+        Load the local embedding model before the first request.
+        
+        Falls back to the Gemini embedding API if the model cannot be loaded.
+        """
+        if self.embedder is None:
+            return
+        try:
+            await self.embedder.start()
+        except Exception as e:
+            logger.warning("Local embedder unavailable, using Gemini embeddings: %s", e)
+            self.embedder.close()
+            self.embedder = None
+    
+    async def warm_semantic_cache(self) -> int:
+        """
+        Load semantic entries that other workers persisted to the shared cache.
+        
+        Only entries embedded by the current model are loaded, at most
+        SEMANTIC_CACHE_MAX_ENTRIES of them, each with the time it had left.
+        
+        Returns:
+            int: Number of entries loaded
+        """
+        if self.semantic_cache is None:
+            return 0
+        
+        loaded = 0
+        now = time.time()
+        entries = await shared_cache.values_by_prefix(
+            f"{_SEMANTIC_PREFIX}{self.embedding_model_id()}:",
+            settings.SEMANTIC_CACHE_MAX_ENTRIES
+        )
+        for entry in entries:
+            remaining = entry["expires_at"] - now
+            if remaining <= 0:
+                continue
+            self.semantic_cache.add(
+                entry["namespace"], entry["text"], entry["embedding"], entry["value"], ttl=remaining
+            )
+            loaded += 1
+        
+        if loaded:
+            logger.info("🔥 Warmed semantic cache with %d shared entries", loaded)
+        return loaded
+    
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the wrapped AIClient."""
+        return getattr(self.client, name)
+
+
+@lru_cache(maxsize=1)
+def get_caching_client() -> CachingAIClient:
+    """
+    Return the shared caching client, creating it on first use.
+    
+    Returns:
+        CachingAIClient: Wrapper around the process-wide AIClient
+    """
+    semantic_cache = None
+    if settings.SEMANTIC_CACHE_ENABLED:
+        semantic_cache = SemanticCache(
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+            ttl=settings.SEMANTIC_CACHE_TTL,
+            quantize=settings.SEMANTIC_CACHE_QUANTIZE
+        )
+    embedder = None
+    if semantic_cache is not None and settings.LOCAL_EMBEDDING_MODEL:
+        embedder = LocalEmbedder(
+            settings.LOCAL_EMBEDDING_MODEL,
+            workers=settings.LOCAL_EMBEDDING_WORKERS
+        )
+    return CachingAIClient(get_ai_client(), semantic_cache, embedder)
@@ -0,0 +1,130 @@
+"""
+Incremental JSON Parsing
+Extracts complete array items from JSON text that arrives in pieces.
+"""
+
+from typing import Any, List, Optional
+import orjson
+
+# Characters that end a number or literal (true/false/null) inside an array
+_SCALAR_END = ",] \t\r\n"
+
+
+class JsonArrayStreamParser:
+    """
+    Yield the items of an object's array field as soon as each one is complete.
+    
+    Built for streamed model output shaped like {"questions": [{...}, {...}]}:
+    every direct child of the named top-level array field is parsed and
+    returned once it ends, so callers can forward items long before the
+    full document is complete. A bare top-level array ([{...}, {...}]) is
+    handled the same way. Other fields, and anything nested inside an
+    item, are never emitted on their own.
+    """
+    
+    def __init__(self, field: str = "questions"):
+        """
+        Initialize an empty parser.
+        
+        Args:
+            field: Name of the root object's array field to stream
+        """
+        self.field = field
+        self._buffer = ""
+        self._pos = 0
+        # Open containers, innermost last ("{" or "[")
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        # Root-object key tracking: whether a key comes next, the key being
+        # read, and the key whose value is currently open
+        self._expect_key = False
+        self._key_start: Optional[int] = None
+        self._pending_key: Optional[str] = None
+        self._key: Optional[str] = None
+        # Depth of the array being streamed while it is open
+        self._items_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+    
+    def feed(self, text: str) -> List[Any]:
+        """
+        Consume the next piece of JSON text.
+        
+        Args:
+            text: Next chunk of the document
+        
+        Returns:
+            list: Items completed by this chunk, in document order
+        """
+        self._buffer += text
+        buffer = self._buffer
+        stack = self._stack
+        items = []
+        
+        for index in range(self._pos, len(buffer)):
+            char = buffer[index]
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._pending_key = orjson.loads(buffer[self._key_start:index + 1])
+                        self._key_start = None
+                    elif self._item_start is not None and len(stack) == self._items_depth:
+                        # A string item ends with its closing quote
+                        items.append(orjson.loads(buffer[self._item_start:index + 1]))
+                        self._item_start = None
+                continue
+            
+            depth = len(stack)
+            if depth == self._items_depth:
+                if self._item_start is not None and char in _SCALAR_END:
+                    # A number or literal item ends at the first delimiter
+                    items.append(orjson.loads(buffer[self._item_start:index]))
+                    self._item_start = None
+                elif self._item_start is None and char not in _SCALAR_END:
+                    self._item_start = index
+            
+            if char == '"':
+                self._in_string = True
+                if depth == 1 and self._expect_key:
+                    self._key_start = index
+            elif char in "{[":
+                if depth == 0:
+                    if char == "[":
+                        self._items_depth = 1
+                    else:
+                        self._expect_key = True
+                elif depth == 1 and char == "[" and stack[0] == "{" and self._key == self.field:
+                    self._items_depth = 2
+                stack.append(char)
+            elif char in "}]":
+                if depth == self._items_depth:
+                    # The streamed array itself is closing
+                    self._items_depth = None
+                stack.pop()
+                if self._item_start is not None and len(stack) == self._items_depth:
+                    items.append(orjson.loads(buffer[self._item_start:index + 1]))
+                    self._item_start = None
+            elif depth == 1 and stack[0] == "{":
+                if char == ":":
+                    self._key = self._pending_key
+                    self._expect_key = False
+                elif char == ",":
+                    self._key = None
+                    self._expect_key = True
+        
+        # Keep only the unfinished item or key (if any) so memory stays bounded
+        starts = [start for start in (self._item_start, self._key_start) if start is not None]
+        keep_from = min(starts) if starts else len(buffer)
+        self._buffer = buffer[keep_from:]
+        if self._item_start is not None:
+            self._item_start -= keep_from
+        if self._key_start is not None:
+            self._key_start -= keep_from
+        self._pos = len(self._buffer)
+        return items
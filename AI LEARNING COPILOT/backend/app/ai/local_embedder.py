@@ -0,0 +1,69 @@
+"""
+Local Embedder
+Computes semantic-cache embeddings with a sentence-transformers model that is
+loaded once per worker process, keeping CPU-bound encoding off the event loop.
+"""
+
+from app.embedding_worker import encode, load_model
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+import asyncio
+import logging
+import multiprocessing
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class LocalEmbedder:
+    """
+    Embeds text in a process pool that keeps the model pinned in memory.
+    """
+    
+    def __init__(self, model_name: str, workers: int = 2):
+        """
+        Initialize the embedder (no processes start until start()).
+        
+        Args:
+            model_name: sentence-transformers model name or path
+            workers: Number of encoding processes
+        """
+        self.model_name = model_name
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    def _executor(self) -> ProcessPoolExecutor:
+        """Return the process pool, creating it on first use."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # spawn, not fork: the server process already runs threads
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=load_model,
+                initargs=(self.model_name,)
+            )
+        return self._pool
+    
+    async def start(self) -> None:
+        """Start every worker and load the model before the first request."""
+        await asyncio.gather(*(self.embed("warm-up") for _ in range(self.workers)))
+        logger.info("🧠 Local embedder ready: %s (%d workers)", self.model_name, self.workers)
+    
+    async def embed(self, text: str) -> List[float]:
+        """
+        Compute an embedding without blocking the event loop.
+        
+        Args:
+            text: Text to embed
+        
+        Returns:
+            list: Unit-length embedding values
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), encode, text)
+    
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
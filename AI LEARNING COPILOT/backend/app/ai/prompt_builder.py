@@ -4,30 +4,83 @@ Constructs intelligent prompts for topic and question generation.
 """
 
 from app.config import settings
-from typing import List
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import string
 
+# Prompts are pure functions of their arguments, so repeats are memoized
+PROMPT_CACHE_SIZE = 256
 
-class PromptBuilder:
+
+class _CompiledTemplate:
     """
-    Build optimized prompts for educational content generation.
+    A str.format-style template parsed once into literal and field pieces.
+    
+    Rendering is a single join over the precomputed pieces, so the format
+    string is never re-parsed per request.
     """
     
-    @staticmethod
-    def build_topics_and_questions_prompt(subject: str) -> str:
+    def __init__(self, source: str):
         """
-        Build a prompt to generate topics and questions for a subject.
+        Parse the template.
         
         Args:
-            subject: The subject name (e.g., "Python", "Data Science")
+            source: Template text with plain {name} fields
             
-        Returns:
-            str: Complete prompt for AI
+        Raises:
+            ValueError: If a field uses a format spec or conversion
+        """
+        self._pieces: List[Tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            if spec or conversion:
+                raise ValueError(f"Unsupported template field: {field}")
+            self._pieces.append((literal, field))
+    
+    def render(self, **values) -> str:
         """
-        max_topics = settings.MAX_TOPICS
-        questions_per_topic = settings.QUESTIONS_PER_TOPIC
+        Substitute values into the template.
         
-        prompt = f"""
-You are an expert educational content creator. Generate learning content for: "{subject}"
+        Args:
+            **values: Value for every field in the template
+            
+        Returns:
+            str: Rendered text
+        """
+        return "".join(
+            literal if field is None else literal + str(values[field])
+            for literal, field in self._pieces
+        )
+
+
+class PromptBuilder:
+    """
+    Build optimized prompts for educational content generation.
+    """
+    
+    # Each prompt is a static _PREFIX_* (instructions, schema, examples),
+    # built once at import, followed by a short _SUFFIX_* holding only the
+    # per-request values, compiled once into a _CompiledTemplate. The prefix
+    # is byte-identical across calls, so Gemini's implicit prefix cache can
+    # reuse it, and per-call rendering only joins the few suffix pieces.
+    # A single short example carries the same formatting signal as a full
+    # multi-topic one at a fraction of the input tokens.
+    _TOPICS_FEWSHOT = """
+EXAMPLE for "Python Programming" (abbreviated - always produce the full counts requested above):
+{
+  "topics": [
+    {
+      "topic": "Python Fundamentals",
+      "questions": [
+        "What are the core data types in Python and when should each be used?",
+        "How does Python's dynamic typing differ from static typing?"
+      ]
+    }
+  ]
+}
+""".strip()
+    
+    _PREFIX_TOPICS = """
+You are an expert educational content creator. Generate learning content for the subject given at the end of this prompt.
 
 TASK:
 Generate {max_topics} comprehensive topics with {questions_per_topic} thought-provoking questions each.
@@ -40,9 +93,9 @@ REQUIREMENTS:
 5. Avoid yes/no questions - focus on "What", "How", "Why", "Explain"
 
 OUTPUT FORMAT (strict JSON):
-{{
+{
   "topics": [
-    {{
+    {
       "topic": "Topic Name 1",
       "questions": [
         "Question 1 text?",
@@ -51,61 +104,28 @@ OUTPUT FORMAT (strict JSON):
         "Question 4 text?",
         "Question 5 text?"
       ]
-    }},
-    {{
+    },
+    {
       "topic": "Topic Name 2",
       "questions": [...]
-    }}
-  ]
-}}
-
-EXAMPLE for "Python Programming":
-{{
-  "topics": [
-    {{
-      "topic": "Python Fundamentals",
-      "questions": [
-        "What are the core data types in Python and when should each be used?",
-        "How does Python's dynamic typing differ from static typing?",
-        "Explain the concept of variables and naming conventions in Python",
-        "What are the advantages of using Python for beginners?",
-        "How do you handle user input and output in Python?"
-      ]
-    }},
-    {{
-      "topic": "Control Flow and Logic",
-      "questions": [
-        "How do if-elif-else statements work in Python?",
-        "What is the difference between while and for loops?",
-        "Explain how to use break and continue statements effectively",
-        "How can you implement nested loops in Python?",
-        "What are list comprehensions and when should you use them?"
-      ]
-    }}
+    }
   ]
-}}
+}
 
-Now generate content for: "{subject}"
+{fewshot}
 
 Return ONLY the JSON object, no additional text.
-"""
-        return prompt.strip()
+""".strip().replace(
+        "{max_topics}", str(settings.MAX_TOPICS)
+    ).replace(
+        "{questions_per_topic}", str(settings.QUESTIONS_PER_TOPIC)
+    ).replace(
+        "{fewshot}", _TOPICS_FEWSHOT
+    ) + "\n\n"
+    _SUFFIX_TOPICS = _CompiledTemplate('Now generate content for: "{subject}"')
     
-    @staticmethod
-    def build_questions_prompt(subject: str, topic: str, count: int = 5) -> str:
-        """
-        Build a prompt to generate only questions for a specific topic.
-        
-        Args:
-            subject: The subject name
-            topic: The specific topic within the subject
-            count: Number of questions to generate
-            
-        Returns:
-            str: Complete prompt for AI
-        """
-        prompt = f"""
-Generate {count} educational questions about "{topic}" in the context of "{subject}".
+    _PREFIX_QUESTIONS = """
+Generate educational questions about the topic given at the end of this prompt, in the context of its subject.
 
 REQUIREMENTS:
 1. Questions should be clear and specific
@@ -115,35 +135,58 @@ REQUIREMENTS:
 5. Vary difficulty from beginner to intermediate
 
 OUTPUT FORMAT (strict JSON):
-{{
+{
   "questions": [
     "Question 1 text?",
     "Question 2 text?",
     "Question 3 text?"
   ]
-}}
+}
 
 Return ONLY the JSON object.
-"""
-        return prompt.strip()
+""".strip() + "\n\n"
+    _SUFFIX_QUESTIONS = _CompiledTemplate("""
+SUBJECT: "{subject}"
+TOPIC: "{topic}"
+NUMBER OF QUESTIONS: {count}
+""".strip())
     
-    @staticmethod
-    def build_quiz_prompt(topic: str, count: int = 5, difficulty: str = "medium") -> str:
-        """
-        Build a prompt for generating quiz questions with multiple choice answers.
-        
-        Args:
-            topic: The topic for the quiz
-            count: Number of questions
-            difficulty: Difficulty level (easy, medium, hard)
-            
-        Returns:
-            str: Complete prompt for AI
-        """
-        prompt = f"""
-Generate {count} multiple-choice quiz questions about "{topic}".
+    _PREFIX_MULTI_TOPIC_QUESTIONS = """
+Generate educational questions for each of the topics listed at the end of this prompt, in the context of their subject.
 
-DIFFICULTY: {difficulty}
+REQUIREMENTS:
+1. Questions should be clear and specific
+2. Mix conceptual and practical questions
+3. Avoid yes/no questions
+4. Focus on understanding and application
+5. Vary difficulty from beginner to intermediate
+6. Return one entry per listed topic, in the same order
+7. Copy each topic name exactly as listed into its "topic" field
+
+OUTPUT FORMAT (strict JSON):
+{
+  "results": [
+    {
+      "topic": "First topic name",
+      "questions": [
+        "Question 1 text?",
+        "Question 2 text?"
+      ]
+    }
+  ]
+}
+
+Return ONLY the JSON object.
+""".strip() + "\n\n"
+    _SUFFIX_MULTI_TOPIC_QUESTIONS = _CompiledTemplate("""
+SUBJECT: "{subject}"
+NUMBER OF QUESTIONS PER TOPIC: {count}
+TOPICS:
+{topics}
+""".strip())
+    
+    _PREFIX_QUIZ = """
+Generate multiple-choice quiz questions about the topic given at the end of this prompt.
 
 REQUIREMENTS:
 1. Each question should have 4 answer options (A, B, C, D)
@@ -152,44 +195,32 @@ REQUIREMENTS:
 4. Questions should test understanding, not just memorization
 
 OUTPUT FORMAT (strict JSON):
-{{
+{
   "questions": [
-    {{
+    {
       "question": "Question text?",
-      "options": {{
+      "options": {
         "A": "Option A text",
         "B": "Option B text",
         "C": "Option C text",
         "D": "Option D text"
-      }},
+      },
       "correct_answer": "B",
       "explanation": "Brief explanation of why B is correct"
-    }}
+    }
   ]
-}}
+}
 
 Return ONLY the JSON object.
-"""
-        return prompt.strip()
+""".strip() + "\n\n"
+    _SUFFIX_QUIZ = _CompiledTemplate("""
+TOPIC: "{topic}"
+DIFFICULTY: {difficulty}
+NUMBER OF QUESTIONS: {count}
+""".strip())
     
-    @staticmethod
-    def build_doubt_answer_prompt(question: str, context: str = "") -> str:
-        """
-        Build a prompt for answering student doubts/questions.
-        
-        Args:
-            question: The student's question
-            context: Optional context about what the student is learning
-            
-        Returns:
-            str: Complete prompt for AI
-        """
-        context_text = f"\nContext: Student is learning about {context}" if context else ""
-        
-        prompt = f"""
-A student asked: "{question}"{context_text}
-
-Provide a clear, helpful, and educational answer with relevant learning resources.
+    _PREFIX_DOUBT = """
+Answer the student question given at the end of this prompt with a clear, helpful, and educational answer and relevant learning resources.
 
 REQUIREMENTS:
 1. Explain concepts clearly and simply (no code blocks or backticks in JSON values)
@@ -202,7 +233,7 @@ REQUIREMENTS:
 IMPORTANT: Do NOT use backticks, code fences, or special characters in the answer text.
 
 OUTPUT FORMAT (strict JSON):
-{{
+{
   "answer": "Your detailed answer here with clear explanations. Do not use backticks or code blocks.",
   "key_points": [
     "Key point 1",
@@ -210,37 +241,25 @@ OUTPUT FORMAT (strict JSON):
     "Key point 3"
   ],
   "video_suggestions": [
-    {{
+    {
       "title": "Video Title for Beginners",
       "description": "Brief description of what this video teaches",
       "search_query": "exact YouTube search term"
-    }},
-    {{
+    },
+    {
       "title": "Video Title for Practice",
       "description": "Brief description of what this video teaches",
       "search_query": "exact YouTube search term"
-    }}
+    }
   ]
-}}
+}
 
 Return ONLY the JSON object, no markdown formatting.
-"""
-        return prompt.strip()
+""".strip() + "\n\n"
+    _SUFFIX_DOUBT = _CompiledTemplate('A student asked: "{question}"{context_text}')
     
-    @staticmethod
-    def build_quiz_generation_prompt(topic: str, count: int = 40) -> str:
-        """
-        Build a prompt to generate quiz questions for a specific topic.
-        
-        Args:
-            topic: The topic for quiz generation
-            count: Number of questions to generate (default: 40)
-            
-        Returns:
-            str: Complete prompt for AI
-        """
-        prompt = f"""
-You are an expert quiz creator. Generate {count} multiple-choice quiz questions about: "{topic}"
+    _PREFIX_QUIZ_GENERATION = """
+You are an expert quiz creator. Generate multiple-choice quiz questions about the topic given at the end of this prompt.
 
 CRITICAL JSON FORMATTING RULES:
 1. Return ONLY valid JSON, no markdown, no backticks, no code fences
@@ -251,7 +270,7 @@ CRITICAL JSON FORMATTING RULES:
 6. No line breaks within string values
 
 REQUIREMENTS:
-1. Create diverse questions covering different aspects of {topic}
+1. Create diverse questions covering different aspects of the topic
 2. Questions should range from basic to advanced level
 3. Each question must have exactly 4 options (A, B, C, D)
 4. Only ONE correct answer per question
@@ -261,47 +280,29 @@ REQUIREMENTS:
 8. Avoid ambiguous or trick questions
 
 OUTPUT FORMAT (strict JSON):
-{{
+{
   "questions": [
-    {{
+    {
       "question": "Question text here?",
-      "options": {{
+      "options": {
         "A": "First option",
         "B": "Second option",
         "C": "Third option",
         "D": "Fourth option"
-      }},
+      },
       "correct_answer": "B",
       "explanation": "Brief explanation why this is correct"
-    }}
+    }
   ]
-}}
-
-Now generate exactly {count} quiz questions for: "{topic}"
+}
 
 IMPORTANT: Return ONLY the JSON object. No markdown, no explanations, no extra text.
-"""
-        return prompt.strip()
-
-    @staticmethod
-    def build_answer_verification_prompt(question: str, student_answer: str) -> str:
-        """
-        Build a prompt to verify if a student's answer is correct.
-        
-        Args:
-            question: The question being answered
-            student_answer: The student's answer
-            
-        Returns:
-            str: Complete prompt for AI
-        """
-        prompt = f"""
+""".strip() + "\n\n"
+    _SUFFIX_QUIZ_GENERATION = _CompiledTemplate('Now generate exactly {count} quiz questions for: "{topic}"')
+    
+    _PREFIX_ANSWER_VERIFICATION = """
 You are an expert educational assessor. Your task is to evaluate a student's answer to a question.
 
-QUESTION: "{question}"
-
-STUDENT ANSWER: "{student_answer}"
-
 TASK:
 1. Evaluate if the student's answer is correct or partially correct
 2. Provide constructive feedback explaining the correctness
@@ -309,11 +310,11 @@ TASK:
 4. Be encouraging and educational in your feedback
 
 OUTPUT FORMAT (strict JSON):
-{{
+{
   "is_correct": true/false,
   "feedback": "Explanation of correctness - be constructive and educational",
   "correct_answer": "What the correct answer should be (if student is wrong)"
-}}
+}
 
 Important:
 - is_correct must be a boolean (true or false)
@@ -323,8 +324,142 @@ Important:
 - No smart quotes, no trailing commas
 
 Now evaluate this answer:
-"""
-        return prompt.strip()
+""".strip() + "\n\n"
+    _SUFFIX_ANSWER_VERIFICATION = _CompiledTemplate("""
+QUESTION: "{question}"
+
+STUDENT ANSWER: "{student_answer}"
+""".strip())
+    
+    @staticmethod
+    @lru_cache(maxsize=PROMPT_CACHE_SIZE)
+    def build_topics_and_questions_prompt(subject: str) -> str:
+        """
+        Build a prompt to generate topics and questions for a subject.
+        
+        Args:
+            subject: The subject name (e.g., "Python", "Data Science")
+            
+        Returns:
+            str: Complete prompt for AI
+        """
+        return PromptBuilder._PREFIX_TOPICS + PromptBuilder._SUFFIX_TOPICS.render(
+            subject=subject
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=PROMPT_CACHE_SIZE)
+    def build_questions_prompt(subject: str, topic: str, count: int = 5) -> str:
+        """
+        Build a prompt to generate only questions for a specific topic.
+        
+        Args:
+            subject: The subject name
+            topic: The specific topic within the subject
+            count: Number of questions to generate
+            
+        Returns:
+            str: Complete prompt for AI
+        """
+        return PromptBuilder._PREFIX_QUESTIONS + PromptBuilder._SUFFIX_QUESTIONS.render(
+            subject=subject, topic=topic, count=count
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=PROMPT_CACHE_SIZE)
+    def build_multi_topic_questions_prompt(
+        subject: str,
+        topics: Tuple[str, ...],
+        count: int = 5
+    ) -> str:
+        """
+        Build one prompt that generates questions for several topics at once.
+        
+        Args:
+            subject: The subject name
+            topics: Topics within the subject (a tuple, so the prompt can be memoized)
+            count: Number of questions per topic
+            
+        Returns:
+            str: Complete prompt for AI
+        """
+        return PromptBuilder._PREFIX_MULTI_TOPIC_QUESTIONS + PromptBuilder._SUFFIX_MULTI_TOPIC_QUESTIONS.render(
+            subject=subject,
+            count=count,
+            topics="\n".join(f'- "{topic}"' for topic in topics)
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=PROMPT_CACHE_SIZE)
+    def build_quiz_prompt(topic: str, count: int = 5, difficulty: str = "medium") -> str:
+        """
+        Build a prompt for generating quiz questions with multiple choice answers.
+        
+        Args:
+            topic: The topic for the quiz
+            count: Number of questions
+            difficulty: Difficulty level (easy, medium, hard)
+            
+        Returns:
+            str: Complete prompt for AI
+        """
+        return PromptBuilder._PREFIX_QUIZ + PromptBuilder._SUFFIX_QUIZ.render(
+            topic=topic, count=count, difficulty=difficulty
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=PROMPT_CACHE_SIZE)
+    def build_doubt_answer_prompt(question: str, context: str = "") -> str:
+        """
+        Build a prompt for answering student doubts/questions.
+        
+        Args:
+            question: The student's question
+            context: Optional context about what the student is learning
+            
+        Returns:
+            str: Complete prompt for AI
+        """
+        context_text = f"\nContext: Student is learning about {context}" if context else ""
+        
+        return PromptBuilder._PREFIX_DOUBT + PromptBuilder._SUFFIX_DOUBT.render(
+            question=question, context_text=context_text
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=PROMPT_CACHE_SIZE)
+    def build_quiz_generation_prompt(topic: str, count: int = 40) -> str:
+        """
+        Build a prompt to generate quiz questions for a specific topic.
+        
+        Args:
+            topic: The topic for quiz generation
+            count: Number of questions to generate (default: 40)
+            
+        Returns:
+            str: Complete prompt for AI
+        """
+        return PromptBuilder._PREFIX_QUIZ_GENERATION + PromptBuilder._SUFFIX_QUIZ_GENERATION.render(
+            topic=topic, count=count
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=PROMPT_CACHE_SIZE)
+    def build_answer_verification_prompt(question: str, student_answer: str) -> str:
+        """
+        Build a prompt to verify if a student's answer is correct.
+        
+        Args:
+            question: The question being answered
+            student_answer: The student's answer
+            
+        Returns:
+            str: Complete prompt for AI
+        """
+        return PromptBuilder._PREFIX_ANSWER_VERIFICATION + PromptBuilder._SUFFIX_ANSWER_VERIFICATION.render(
+            question=question,
+            student_answer=student_answer
+        )
 
 
 # Create global prompt builder instance
@@ -0,0 +1,130 @@
+"""
+Semantic Response Cache
+Serves AI responses for near-duplicate requests using embedding similarity.
+"""
+
+from app.ai.vector_index import VectorIndex, normalize
+from collections import OrderedDict
+from itertools import count
+from typing import Optional, Dict, Any, List, Tuple
+import logging
+import time
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class _Partition:
+    """Entries and similarity index for one namespace."""
+    
+    def __init__(self, quantize: bool):
+        # key -> (vector id, cached value, expiry timestamp)
+        self.entries: "OrderedDict[str, Tuple[int, Any, float]]" = OrderedDict()
+        self.index = VectorIndex(quantize=quantize)
+        self.keys: Dict[int, str] = {}
+    
+    def remove(self, key: str) -> None:
+        """Drop an entry and its vector."""
+        vector_id = self.entries.pop(key)[0]
+        self.index.remove(vector_id)
+        del self.keys[vector_id]
+
+
+class SemanticCache:
+    """
+    In-memory embedding cache with per-namespace LRU eviction and TTL.
+    
+    Each namespace keeps a VectorIndex, so a lookup is one top-1
+    inner-product search (SIMD via FAISS when installed) instead of a
+    Python loop over every cached embedding.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        max_entries: int = 512,
+        ttl: int = 3600,
+        quantize: bool = False
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Maximum entries kept per namespace
+            ttl: Seconds an entry stays valid
+            quantize: Store embeddings as 8-bit integers
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.quantize = quantize
+        self._namespaces: Dict[str, _Partition] = {}
+        self._ids = count()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+    
+    def lookup(self, namespace: str, embedding: List[float]) -> Optional[Any]:
+        """
+        Find the most similar cached entry above the threshold.
+        
+        Args:
+            namespace: Cache partition (e.g. one per service method)
+            embedding: Embedding of the incoming request
+        
+        Returns:
+            Cached value of the best match, or None on a miss
+        """
+        partition = self._namespaces.get(namespace)
+        if partition is None or not partition.entries:
+            self.stats["misses"] += 1
+            return None
+        
+        query = normalize(embedding)
+        now = time.monotonic()
+        
+        # Expired entries are dropped as they surface as the best match
+        while True:
+            match = partition.index.search(query)
+            if match is None or match[1] < self.threshold:
+                self.stats["misses"] += 1
+                return None
+            key = partition.keys[match[0]]
+            if partition.entries[key][2] > now:
+                break
+            partition.remove(key)
+        
+        logger.debug("Semantic cache hit in %s (similarity %.3f)", namespace, match[1])
+        partition.entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return partition.entries[key][1]
+    
+    def add(
+        self,
+        namespace: str,
+        key: str,
+        embedding: List[float],
+        value: Any,
+        ttl: Optional[float] = None
+    ) -> None:
+        """
+        Store a value under its embedding.
+        
+        Args:
+            namespace: Cache partition (e.g. one per service method)
+            key: Text the embedding was computed from
+            embedding: Embedding of the request
+            value: Response to cache
+            ttl: Seconds the entry stays valid (defaults to the cache TTL)
+        """
+        partition = self._namespaces.get(namespace)
+        if partition is None:
+            partition = self._namespaces[namespace] = _Partition(self.quantize)
+        if key in partition.entries:
+            partition.remove(key)
+        
+        vector_id = next(self._ids)
+        partition.index.add(vector_id, normalize(embedding))
+        partition.keys[vector_id] = key
+        partition.entries[key] = (vector_id, value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        while len(partition.entries) > self.max_entries:
+            partition.remove(next(iter(partition.entries)))
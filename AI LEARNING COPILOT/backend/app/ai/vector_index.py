@@ -0,0 +1,168 @@
+"""
+Vector Index
+Nearest-neighbour search over unit-length embeddings for the semantic cache.
+Uses FAISS (SIMD inner-product kernels) when installed, plain Python otherwise.
+Vectors can be stored as 8-bit integers to cut memory about 4x.
+"""
+
+from array import array
+from typing import Dict, List, Optional, Tuple, Union
+import math
+
+try:
+    import faiss
+    import numpy as np
+except ImportError:
+    faiss = None
+    np = None
+
+
+def normalize(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length so a dot product equals cosine similarity."""
+    norm = math.sqrt(sum(value * value for value in vector))
+    if norm == 0:
+        return list(vector)
+    return [value / norm for value in vector]
+
+
+# Scale mapping unit-vector components in [-1, 1] onto signed bytes
+_INT8_SCALE = 127
+
+
+class _FaissIndex:
+    """Inner-product index backed by FAISS (flat float32 or 8-bit scalar quantized)."""
+    
+    def __init__(self, dim: int, quantize: bool):
+        if quantize:
+            base = faiss.IndexScalarQuantizer(
+                dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
+            # Unit vectors always lie in [-1, 1] per dimension, so training on
+            # the two corners fixes the quantizer range without sample data
+            base.train(np.asarray([[-1.0] * dim, [1.0] * dim], dtype="float32"))
+        else:
+            base = faiss.IndexFlatIP(dim)
+        # IDMap2 lets entries be addressed (and removed) by our own ids
+        self._index = faiss.IndexIDMap2(base)
+    
+    def __len__(self) -> int:
+        return self._index.ntotal
+    
+    def add(self, vector_id: int, vector: List[float]) -> None:
+        self._index.add_with_ids(
+            np.asarray([vector], dtype="float32"),
+            np.asarray([vector_id], dtype="int64")
+        )
+    
+    def remove(self, vector_id: int) -> None:
+        self._index.remove_ids(np.asarray([vector_id], dtype="int64"))
+    
+    def search(self, query: List[float]) -> Optional[Tuple[int, float]]:
+        if self._index.ntotal == 0:
+            return None
+        scores, ids = self._index.search(np.asarray([query], dtype="float32"), 1)
+        if ids[0][0] < 0:
+            return None
+        return int(ids[0][0]), float(scores[0][0])
+
+
+class _PythonIndex:
+    """Linear-scan fallback used when FAISS is not installed."""
+    
+    def __init__(self, dim: int, quantize: bool):
+        self._quantize = quantize
+        self._vectors: Dict[int, Union[array, List[float]]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._vectors)
+    
+    def add(self, vector_id: int, vector: List[float]) -> None:
+        if self._quantize:
+            # One byte per dimension instead of a boxed float
+            self._vectors[vector_id] = array(
+                "b", [round(value * _INT8_SCALE) for value in vector]
+            )
+        else:
+            self._vectors[vector_id] = vector
+    
+    def remove(self, vector_id: int) -> None:
+        self._vectors.pop(vector_id, None)
+    
+    def search(self, query: List[float]) -> Optional[Tuple[int, float]]:
+        best = None
+        for vector_id, vector in self._vectors.items():
+            score = sum(a * b for a, b in zip(query, vector))
+            if best is None or score > best[1]:
+                best = (vector_id, score)
+        if best is not None and self._quantize:
+            best = (best[0], best[1] / _INT8_SCALE)
+        return best
+
+
+class VectorIndex:
+    """
+    Top-1 inner-product index keyed by integer ids.
+    
+    Vectors are expected to be unit length, so scores are cosine
+    similarities. The backend is created on the first add, once the
+    embedding dimension is known.
+    """
+    
+    def __init__(self, quantize: bool = False):
+        """
+        Initialize an empty index.
+        
+        Args:
+            quantize: Store vectors as 8-bit integers (about 4x smaller,
+                similarity error well under 0.01)
+        """
+        self.quantize = quantize
+        self.dim: Optional[int] = None
+        self._backend = None
+    
+    def __len__(self) -> int:
+        return len(self._backend) if self._backend is not None else 0
+    
+    def add(self, vector_id: int, vector: List[float]) -> None:
+        """
+        Insert a unit vector.
+        
+        Args:
+            vector_id: Caller-assigned id, unique within this index
+            vector: Unit-length embedding
+        
+        Raises:
+            ValueError: If the vector's dimension differs from the index's
+        """
+        if self._backend is None:
+            backend = _FaissIndex if faiss is not None else _PythonIndex
+            self.dim = len(vector)
+            self._backend = backend(self.dim, self.quantize)
+        elif len(vector) != self.dim:
+            raise ValueError(f"Expected a {self.dim}-dimensional vector, got {len(vector)}")
+        self._backend.add(vector_id, vector)
+    
+    def remove(self, vector_id: int) -> None:
+        """
+        Delete a vector by id (unknown ids are ignored).
+        
+        Args:
+            vector_id: Id passed to add()
+        """
+        if self._backend is not None:
+            self._backend.remove(vector_id)
+    
+    def search(self, query: List[float]) -> Optional[Tuple[int, float]]:
+        """
+        Find the most similar vector.
+        
+        Args:
+            query: Unit-length query embedding
+        
+        Returns:
+            tuple: (vector id, cosine similarity), or None if the index is
+                empty or the query's dimension differs from the index's
+        """
+        if self._backend is None or len(query) != self.dim:
+            return None
+        return self._backend.search(query)
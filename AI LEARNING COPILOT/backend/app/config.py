@@ -27,11 +27,46 @@ class Settings:
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")  # Latest stable model
     GEMINI_MAX_TOKENS: int = int(os.getenv("GEMINI_MAX_TOKENS", "2000"))
     GEMINI_TEMPERATURE: float = float(os.getenv("GEMINI_TEMPERATURE", "0.7"))
+    # Grading should not vary between calls; 0 also makes verification cacheable
+    GEMINI_VERIFY_TEMPERATURE: float = float(os.getenv("GEMINI_VERIFY_TEMPERATURE", "0"))
+    GEMINI_MAX_CONCURRENCY: int = int(os.getenv("GEMINI_MAX_CONCURRENCY", "20"))
+    GEMINI_MAX_ATTEMPTS: int = int(os.getenv("GEMINI_MAX_ATTEMPTS", "3"))
+    GEMINI_RETRY_MAX_DELAY: float = float(os.getenv("GEMINI_RETRY_MAX_DELAY", "10"))
+    
+    # LLM Response Cache (deterministic calls only: answer verification, plus
+    # every call when GEMINI_TEMPERATURE is 0)
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "256"))
+    LLM_CACHE_DIR: Optional[str] = os.getenv("LLM_CACHE_DIR")  # Enables on-disk cache (requires diskcache)
+    
+    # Shared Redis Cache (optional, shared by all workers; requires redis)
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
+    REDIS_CACHE_TTL: int = int(os.getenv("REDIS_CACHE_TTL", "3600"))
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "20"))
+    
+    # Exact-match Prompt Cache
+    PROMPT_CACHE_MAX_ENTRIES: int = int(os.getenv("PROMPT_CACHE_MAX_ENTRIES", "1024"))
+    PROMPT_CACHE_TTL: int = int(os.getenv("PROMPT_CACHE_TTL", "3600"))
+    
+    # Serialized bodies of repeated pass-through requests (per worker)
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+    
+    # Semantic Response Cache (embedding similarity, off by default)
+    SEMANTIC_CACHE_ENABLED: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "False").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    SEMANTIC_CACHE_MAX_ENTRIES: int = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "512"))
+    SEMANTIC_CACHE_TTL: int = int(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+    SEMANTIC_CACHE_QUANTIZE: bool = os.getenv("SEMANTIC_CACHE_QUANTIZE", "True").lower() == "true"
+    GEMINI_EMBEDDING_MODEL: str = os.getenv("GEMINI_EMBEDDING_MODEL", "text-embedding-004")
+    # Local sentence-transformers model (e.g. "all-MiniLM-L6-v2") used instead of the Gemini embedding API
+    LOCAL_EMBEDDING_MODEL: Optional[str] = os.getenv("LOCAL_EMBEDDING_MODEL")
+    LOCAL_EMBEDDING_WORKERS: int = int(os.getenv("LOCAL_EMBEDDING_WORKERS", "2"))
     
     # Server Configuration
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
     # CORS Configuration
     CORS_ORIGINS: list = [
@@ -45,6 +80,12 @@ class Settings:
     # Generation Limits
     MAX_TOPICS: int = int(os.getenv("MAX_TOPICS", "9"))
     QUESTIONS_PER_TOPIC: int = int(os.getenv("QUESTIONS_PER_TOPIC", "5"))
+    MULTI_TOPIC_MAX_TOPICS: int = int(os.getenv("MULTI_TOPIC_MAX_TOPICS", "12"))
+    
+    # Batch Generation
+    BATCH_MAX_SUBJECTS: int = int(os.getenv("BATCH_MAX_SUBJECTS", "20"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "10"))
+    QUIZ_BATCH_CHUNK_SIZE: int = int(os.getenv("QUIZ_BATCH_CHUNK_SIZE", "10"))  # Questions per Batch API request
     
     def validate(self) -> bool:
         """
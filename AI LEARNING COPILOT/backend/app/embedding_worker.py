@@ -0,0 +1,22 @@
+"""
+Embedding Worker
+Functions run inside the local embedder's process pool. Kept outside the
+app.ai package so spawned workers import only this module, not the server.
+"""
+
+from typing import List
+
+# Model instance of the current pool worker (set by the pool initializer)
+_model = None
+
+
+def load_model(model_name: str) -> None:
+    """Pool initializer: load the model once per worker process."""
+    global _model
+    from sentence_transformers import SentenceTransformer
+    _model = SentenceTransformer(model_name, device="cpu")
+
+
+def encode(text: str) -> List[float]:
+    """Encode one text into a unit-length embedding."""
+    return _model.encode(text, normalize_embeddings=True).tolist()
@@ -0,0 +1,55 @@
+"""
+Logging Setup
+Routes log records through a queue so handler I/O runs on a background thread.
+"""
+
+from typing import Optional
+import logging
+import logging.handlers
+import queue
+
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: str = "INFO") -> None:
+    """
+    Install a non-blocking root handler.
+    
+    Coroutines only enqueue records; a QueueListener thread formats and
+    writes them to stderr, so a slow terminal or pipe never stalls the
+    event loop. Calling this more than once has no effect.
+    
+    Args:
+        level: Root log level name (e.g. "INFO", "DEBUG")
+    """
+    global _queue_handler, _listener
+    if _listener is not None:
+        return
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    root.addHandler(_queue_handler)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background logging thread."""
+    global _queue_handler, _listener
+    if _listener is None:
+        return
+    
+    logging.getLogger().removeHandler(_queue_handler)
+    # stop() drains everything already queued before returning
+    _listener.stop()
+    _queue_handler = None
+    _listener = None
@@ -7,9 +7,19 @@ configures middleware, and registers all routes.
 """
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
+from app.logging_setup import setup_logging, shutdown_logging
 from app.routes import subject_routes
+from app.ai.ai_client import get_ai_client
+from app.ai.caching_client import get_caching_client
+from app.utils.prompt_cache import prompt_cache
+from app.utils.response_cache import response_cache
+from app.utils.shared_cache import shared_cache
+
+# Log through a background thread so handler I/O never blocks the event loop
+setup_logging(settings.LOG_LEVEL)
 
 # Initialize FastAPI app with metadata
 app = FastAPI(
@@ -18,6 +28,7 @@ app = FastAPI(
     description=settings.API_DESCRIPTION,
     docs_url="/docs",  # Swagger UI
     redoc_url="/redoc",  # ReDoc documentation
+    default_response_class=ORJSONResponse,  # Serialize responses with orjson
 )
 
 
@@ -40,6 +51,29 @@ app.include_router(
 )
 
 
+@app.on_event("startup")
+async def startup_event():
+    """
+    Open pooled outbound connections inside the server's event loop.
+    """
+    await get_ai_client().startup()
+    await shared_cache.connect()
+    await get_caching_client().start_embedder()
+    await get_caching_client().warm_semantic_cache()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Release pooled outbound connections and flush logs when the server stops.
+    """
+    await get_ai_client().aclose()
+    await shared_cache.close()
+    if get_caching_client().embedder is not None:
+        get_caching_client().embedder.close()
+    shutdown_logging()
+
+
 @app.get("/")
 async def root():
     """
@@ -51,7 +85,8 @@ async def root():
         "version": settings.API_VERSION,
         "docs": "/docs",
         "endpoints": {
-            "generate": "/api/generate"
+            "generate": "/api/generate",
+            "generate_batch": "/api/generate-batch"
         }
     }
 
@@ -61,9 +96,16 @@ async def health_check():
     """
     Health check endpoint for monitoring and deployment.
     """
+    caching_client = get_caching_client()
+    semantic_cache = caching_client.semantic_cache
     return {
         "status": "healthy",
-        "api_version": settings.API_VERSION
+        "api_version": settings.API_VERSION,
+        "cache": get_ai_client().cache.stats,
+        "prompt_cache": prompt_cache.stats,
+        "response_cache": response_cache.stats,
+        "shared_cache": shared_cache.enabled,
+        "semantic_cache": semantic_cache.stats if semantic_cache else None
     }
 
 
@@ -5,6 +5,9 @@ Models module for Pydantic schemas.
 from .schemas import (
     GenerateRequest,
     GenerateResponse,
+    GenerateBatchRequest,
+    GenerateBatchResponse,
+    BatchItemError,
     Topic,
     Question,
     ErrorResponse
@@ -13,6 +16,9 @@ from .schemas import (
 __all__ = [
     'GenerateRequest',
     'GenerateResponse',
+    'GenerateBatchRequest',
+    'GenerateBatchResponse',
+    'BatchItemError',
     'Topic',
     'Question',
     'ErrorResponse'
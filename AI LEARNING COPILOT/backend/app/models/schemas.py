@@ -3,7 +3,7 @@ Pydantic Models (Schemas) for Request/Response Validation
 These models define the structure of data coming in and going out of the API.
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import List, Optional
 
 
@@ -12,6 +12,14 @@ class GenerateRequest(BaseModel):
     Request model for /api/generate endpoint.
     User provides a subject name to generate topics and questions for.
     """
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "subject": "Python Programming"
+            }
+        }
+    )
+    
     subject: str = Field(
         ...,
         min_length=1,
@@ -19,15 +27,17 @@ class GenerateRequest(BaseModel):
         description="Subject name (e.g., Python, JavaScript, Data Science)"
     )
     
-    @validator('subject')
-    def validate_subject(cls, v):
+    @field_validator('subject', mode='before')
+    @classmethod
+    def validate_subject(cls, v: str) -> str:
         """Validate and clean subject input"""
-        # Remove extra whitespace
-        v = v.strip()
-        
-        # Ensure not empty after stripping
-        if not v:
-            raise ValueError("Subject cannot be empty")
+        # Remove extra whitespace (runs before length constraints are checked)
+        if isinstance(v, str):
+            v = v.strip()
+            
+            # Ensure not empty after stripping
+            if not v:
+                raise ValueError("Subject cannot be empty")
         
         return v
 
@@ -43,11 +53,17 @@ class Topic(BaseModel):
     """
     Model for a topic with its associated questions.
     """
-    topic: str = Field(..., description="Topic name")
+    topic: str = Field("Unnamed Topic", description="Topic name")
     questions: List[str] = Field(
-        ...,
+        default_factory=list,
         description="List of questions for this topic"
     )
+    
+    @field_validator('questions', mode='before')
+    @classmethod
+    def validate_questions(cls, v):
+        """Treat a malformed (non-list) questions value from the AI as empty"""
+        return v if isinstance(v, list) else []
 
 
 class GenerateResponse(BaseModel):
@@ -55,6 +71,34 @@ class GenerateResponse(BaseModel):
     Response model for /api/generate endpoint.
     Returns the subject with generated topics and questions.
     """
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "subject": "Python Programming",
+                "topics": [
+                    {
+                        "topic": "Python Basics",
+                        "questions": [
+                            "What is Python and why is it popular?",
+                            "How do you declare variables in Python?",
+                            "What are Python data types?"
+                        ]
+                    },
+                    {
+                        "topic": "Python Functions",
+                        "questions": [
+                            "How do you define a function in Python?",
+                            "What are function parameters and arguments?",
+                            "Explain lambda functions in Python"
+                        ]
+                    }
+                ],
+                "total_topics": 2,
+                "total_questions": 6
+            }
+        }
+    )
+    
     subject: str = Field(..., description="Original subject name")
     topics: List[Topic] = Field(
         ...,
@@ -64,6 +108,64 @@ class GenerateResponse(BaseModel):
     total_questions: int = Field(..., description="Total number of questions generated")
 
 
+class GenerateBatchRequest(BaseModel):
+    """
+    Request model for /api/generate-batch endpoint.
+    User provides several subjects to generate content for in one call.
+    """
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "subjects": ["Python Programming", "Data Science"]
+            }
+        }
+    )
+    
+    subjects: List[str] = Field(
+        ...,
+        min_length=1,
+        description="Subject names to generate topics and questions for"
+    )
+    
+    @field_validator('subjects')
+    @classmethod
+    def validate_subjects(cls, v: List[str]) -> List[str]:
+        """Strip each subject and reject blank or overly long entries"""
+        cleaned = [subject.strip() for subject in v]
+        
+        if any(not subject for subject in cleaned):
+            raise ValueError("Subjects cannot be empty")
+        if any(len(subject) > 100 for subject in cleaned):
+            raise ValueError("Subjects must be at most 100 characters")
+        
+        return cleaned
+
+
+class BatchItemError(BaseModel):
+    """
+    A subject that failed within a batch request.
+    """
+    subject: str = Field(..., description="Subject that failed")
+    message: str = Field(..., description="Why generation failed")
+
+
+class GenerateBatchResponse(BaseModel):
+    """
+    Response model for /api/generate-batch endpoint.
+    Successful subjects are in results; failures never fail the whole batch.
+    """
+    results: List[GenerateResponse] = Field(
+        ...,
+        description="Generated content for each successful subject"
+    )
+    errors: List[BatchItemError] = Field(
+        default_factory=list,
+        description="Subjects that could not be generated"
+    )
+    total_subjects: int = Field(..., description="Number of subjects requested")
+    total_failed: int = Field(..., description="Number of subjects that failed")
+
+
 class ErrorResponse(BaseModel):
     """
     Error response model for API errors.
@@ -71,41 +173,3 @@ class ErrorResponse(BaseModel):
     error: str = Field(..., description="Error type")
     message: str = Field(..., description="Detailed error message")
     details: Optional[str] = Field(None, description="Additional error details")
-
-
-# Example usage in documentation (Pydantic v2)
-GenerateRequest.model_config = {
-    "json_schema_extra": {
-        "example": {
-            "subject": "Python Programming"
-        }
-    }
-}
-
-GenerateResponse.model_config = {
-    "json_schema_extra": {
-        "example": {
-            "subject": "Python Programming",
-            "topics": [
-                {
-                    "topic": "Python Basics",
-                    "questions": [
-                        "What is Python and why is it popular?",
-                        "How do you declare variables in Python?",
-                        "What are Python data types?"
-                    ]
-                },
-                {
-                    "topic": "Python Functions",
-                    "questions": [
-                        "How do you define a function in Python?",
-                        "What are function parameters and arguments?",
-                        "Explain lambda functions in Python"
-                    ]
-                }
-            ],
-            "total_topics": 2,
-            "total_questions": 6
-        }
-    }
-}
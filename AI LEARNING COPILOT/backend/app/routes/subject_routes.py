@@ -3,12 +3,23 @@ API Routes for Subject/Topic/Question Generation
 All endpoints for AI content generation.
 """
 
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import GenerateRequest, GenerateResponse, ErrorResponse
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from app.config import settings
+from app.models.schemas import (
+    GenerateRequest,
+    GenerateResponse,
+    GenerateBatchRequest,
+    GenerateBatchResponse,
+    BatchItemError,
+    ErrorResponse
+)
 from app.services.subject_service import subject_service
+from app.utils.response_cache import response_cache
 from app.utils.response_helper import response_helper
-from typing import Dict, Any
+from typing import Dict, Any, List, AsyncIterator
 import logging
+import orjson
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -76,10 +87,10 @@ async def generate_content(request: GenerateRequest):
             )
         
         # Generate content
-        logger.info(f"API Request: Generate content for '{request.subject}'")
+        logger.info("API Request: Generate content for '%s'", request.subject)
         result = await subject_service.generate_content(request.subject)
         
-        logger.info(f"API Response: Generated {result.total_topics} topics successfully")
+        logger.info("API Response: Generated %d topics successfully", result.total_topics)
         return result
         
     except HTTPException:
@@ -87,10 +98,78 @@ async def generate_content(request: GenerateRequest):
         raise
     except Exception as e:
         # Handle unexpected errors
-        logger.error(f"Unexpected error in /generate: {str(e)}")
+        logger.error("Unexpected error in /generate: %s", e)
         raise response_helper.handle_service_error(e, "Content Generation")
 
 
+@router.post(
+    "/generate-batch",
+    response_model=GenerateBatchResponse,
+    responses={
+        200: {"description": "Batch processed; see errors for failed subjects"},
+        400: {"model": ErrorResponse, "description": "Invalid request"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Generate Topics and Questions for Several Subjects",
+    description="Generate AI-powered topics and questions for a list of subjects concurrently"
+)
+async def generate_batch(request: GenerateBatchRequest):
+    """
+    Generate educational content for several subjects in one request.
+    
+    **Request Body:**
+    - `subjects`: List of subject names
+    
+    **Response:**
+    - `results`: Generated content for each successful subject
+    - `errors`: Subjects that failed, with the reason
+    - `total_subjects`: Number of subjects requested
+    - `total_failed`: Number of subjects that failed
+    
+    **Example Request:**
+    ```json
+    {
+      "subjects": ["Python Programming", "Data Science"]
+    }
+    ```
+    """
+    try:
+        # Validate batch size
+        response_helper.validate_request(
+            len(request.subjects) <= settings.BATCH_MAX_SUBJECTS,
+            f"At most {settings.BATCH_MAX_SUBJECTS} subjects are allowed per batch"
+        )
+        
+        # Generate content for all subjects concurrently
+        logger.info("API Request: Generate batch for %d subjects", len(request.subjects))
+        outcomes = await subject_service.generate_many(request.subjects)
+        
+        results = []
+        errors = []
+        for subject, outcome in zip(request.subjects, outcomes):
+            if isinstance(outcome, Exception):
+                errors.append(BatchItemError(subject=subject, message=str(outcome)))
+            else:
+                results.append(outcome)
+        
+        logger.info(
+            "API Response: Batch generated %d subjects, %d failed",
+            len(results), len(errors)
+        )
+        return GenerateBatchResponse(
+            results=results,
+            errors=errors,
+            total_subjects=len(request.subjects),
+            total_failed=len(errors)
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in /generate-batch: %s", e)
+        raise response_helper.handle_service_error(e, "Batch Generation")
+
+
 @router.post(
     "/generate-questions",
     summary="Generate Questions for Topic",
@@ -123,16 +202,78 @@ async def generate_questions(
             "Count must be between 1 and 20"
         )
         
+        # Repeated requests get the stored bytes without re-encoding
+        cache_key = response_cache.make_key("generate-questions", subject, topic, count)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Generate questions
-        logger.info(f"Generating {count} questions for {subject} - {topic}")
+        logger.info("Generating %d questions for %s - %s", count, subject, topic)
         result = await subject_service.generate_topic_questions(subject, topic, count)
         
-        return response_helper.success_response(result)
+        return response_cache.set(cache_key, response_helper.success_response(result))
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in /generate-questions: {str(e)}")
+        logger.error("Error in /generate-questions: %s", e)
+        raise response_helper.handle_service_error(e, "Question Generation")
+
+
+@router.post(
+    "/generate-questions-multi",
+    summary="Generate Questions for Several Topics",
+    description="Generate questions for several topics of one subject in a single AI call"
+)
+async def generate_questions_multi(
+    subject: str,
+    topic: List[str] = Query(...),
+    count: int = 5
+) -> Dict[str, Any]:
+    """
+    Generate questions for several topics at once.
+    
+    **Query Parameters:**
+    - `subject`: Subject name
+    - `topic`: Topic within the subject (repeat the parameter for each topic)
+    - `count`: Number of questions per topic (default: 5)
+    
+    **Example:**
+    `/api/generate-questions-multi?subject=Python&topic=Functions&topic=Classes&count=3`
+    """
+    try:
+        # Validate inputs
+        topics = [t.strip() for t in topic if t.strip()]
+        response_helper.validate_request(
+            subject and topics,
+            "Subject and at least one topic are required"
+        )
+        response_helper.validate_request(
+            len(topics) <= settings.MULTI_TOPIC_MAX_TOPICS,
+            f"At most {settings.MULTI_TOPIC_MAX_TOPICS} topics are allowed per request"
+        )
+        response_helper.validate_request(
+            1 <= count <= 20,
+            "Count must be between 1 and 20"
+        )
+        
+        # Repeated requests get the stored bytes without re-encoding
+        cache_key = response_cache.make_key("generate-questions-multi", subject, topics, count)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Generate questions
+        logger.info("Generating %d questions each for %d topics of %s", count, len(topics), subject)
+        result = await subject_service.generate_questions_multi(subject, topics, count)
+        
+        return response_cache.set(cache_key, response_helper.success_response(result))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error in /generate-questions-multi: %s", e)
         raise response_helper.handle_service_error(e, "Question Generation")
 
 
@@ -143,7 +284,8 @@ async def generate_questions(
 )
 async def generate_quiz(
     topic: str,
-    count: int = 10
+    count: int = 10,
+    mode: str = "sync"
 ) -> Dict[str, Any]:
     """
     Generate a quiz with multiple choice questions.
@@ -151,6 +293,8 @@ async def generate_quiz(
     **Query Parameters:**
     - `topic`: Quiz topic
     - `count`: Number of questions (default: 10)
+    - `mode`: `sync` (default) returns the quiz; `batch` queues a cheaper
+      background job and responds `202 Accepted` with a `status_url` to poll
     
     **Example:**
     `/api/generate-quiz?topic=Python Functions&count=10`
@@ -162,20 +306,111 @@ async def generate_quiz(
             1 <= count <= 50,
             "Count must be between 1 and 50"
         )
+        response_helper.validate_request(
+            mode in ("sync", "batch"),
+            "Mode must be 'sync' or 'batch'"
+        )
+        
+        # Repeated sync requests get the stored bytes without re-encoding
+        cache_key = response_cache.make_key("generate-quiz", topic, count)
+        if mode == "sync":
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                # A hit skips the service, so register the answer keys here;
+                # they may have expired or been replaced since the quiz was cached
+                await subject_service.remember_answers(orjson.loads(cached.body)["data"]["questions"])
+                return cached
         
         # Generate quiz
-        logger.info(f"Generating {count} quiz questions for {topic}")
-        result = await subject_service.generate_quiz(topic, count)
+        logger.info("Generating %d quiz questions for %s (%s)", count, topic, mode)
+        result = await subject_service.generate_quiz(topic, count, mode)
         
-        return response_helper.success_response(result)
+        if mode == "batch":
+            result["status_url"] = f"/api/quiz-batches/{result['batch_id']}"
+            return ORJSONResponse(
+                status_code=202,
+                content=response_helper.success_response(result, message="Quiz batch accepted"),
+                headers={"Retry-After": "30"}
+            )
+        
+        return response_cache.set(cache_key, response_helper.success_response(result))
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in /generate-quiz: {str(e)}")
+        logger.error("Error in /generate-quiz: %s", e)
         raise response_helper.handle_service_error(e, "Quiz Generation")
 
 
+@router.post(
+    "/generate-quiz/stream",
+    summary="Stream Quiz",
+    description="Stream multiple-choice quiz questions as newline-delimited JSON while they are generated"
+)
+async def stream_quiz(
+    topic: str,
+    count: int = 10
+) -> StreamingResponse:
+    """
+    Stream a quiz one question per line (NDJSON).
+    
+    **Query Parameters:**
+    - `topic`: Quiz topic
+    - `count`: Number of questions (default: 10)
+    
+    Each line is one question object. If generation fails part-way, the
+    last line is `{"error": "..."}`.
+    
+    **Example:**
+    `/api/generate-quiz/stream?topic=Python Functions&count=10`
+    """
+    # Validate inputs before the response starts; errors after that can't change the status
+    response_helper.validate_request(topic, "Topic is required")
+    response_helper.validate_request(
+        1 <= count <= 50,
+        "Count must be between 1 and 50"
+    )
+    
+    logger.info("Streaming %d quiz questions for %s", count, topic)
+    
+    async def ndjson_lines() -> AsyncIterator[bytes]:
+        try:
+            async for question in subject_service.stream_quiz(topic, count):
+                yield orjson.dumps(question) + b"\n"
+        except Exception as e:
+            logger.error("Error in /generate-quiz/stream: %s", e)
+            yield orjson.dumps({"error": str(e)}) + b"\n"
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/quiz-batches/{batch_id}",
+    summary="Get Quiz Batch Status",
+    description="Check a batch quiz job and retrieve the quiz once it is ready"
+)
+async def get_quiz_batch(batch_id: str) -> Dict[str, Any]:
+    """
+    Poll a quiz submitted with `mode=batch`.
+    
+    **Path Parameters:**
+    - `batch_id`: Id returned by `/api/generate-quiz?mode=batch`
+    
+    **Response:**
+    - `status`: `PENDING`, `RUNNING`, `SUCCEEDED`, `FAILED`, `CANCELLED` or `EXPIRED`
+    - `result`: The quiz once `status` is `SUCCEEDED`, otherwise null
+    """
+    try:
+        result = await subject_service.get_quiz_batch(batch_id)
+        return response_helper.success_response(result)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error in /quiz-batches: %s", e)
+        raise response_helper.handle_service_error(e, "Quiz Batch Retrieval")
+
+
 @router.post(
     "/answer-doubt",
     summary="Answer Student Doubt",
@@ -199,16 +434,22 @@ async def answer_doubt(
         # Validate input
         response_helper.validate_request(question, "Question is required")
         
+        # Repeated requests get the stored bytes without re-encoding
+        cache_key = response_cache.make_key("answer-doubt", question, context)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Answer doubt
-        logger.info(f"Answering doubt: {question[:50]}...")
+        logger.info("Answering doubt: %s...", question[:50])
         result = await subject_service.answer_doubt(question, context)
         
-        return response_helper.success_response(result)
+        return response_cache.set(cache_key, response_helper.success_response(result))
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in /answer-doubt: {str(e)}")
+        logger.error("Error in /answer-doubt: %s", e)
         raise response_helper.handle_service_error(e, "Doubt Answering")
 
 
@@ -241,7 +482,7 @@ async def verify_answer(
         response_helper.validate_request(answer, "Answer is required")
         
         # Verify answer using AI
-        logger.info(f"Verifying answer for: {question[:50]}...")
+        logger.info("Verifying answer for: %s...", question[:50])
         result = await subject_service.verify_answer(question, answer)
         
         return response_helper.success_response(result)
@@ -249,6 +490,6 @@ async def verify_answer(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in /verify-answer: {str(e)}")
+        logger.error("Error in /verify-answer: %s", e)
         raise response_helper.handle_service_error(e, "Answer Verification")
 
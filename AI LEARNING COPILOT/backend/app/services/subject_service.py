@@ -3,22 +3,134 @@ Subject Service Layer
 Business logic for generating educational content.
 """
 
-from app.ai.ai_client import ai_client
+from app.config import settings
+from app.ai.ai_client import get_ai_client
+from app.ai.caching_client import get_caching_client
 from app.ai.prompt_builder import prompt_builder
 from app.models.schemas import GenerateResponse, Topic
-from typing import Dict, Any
+from app.utils.prompt_cache import prompt_cache
+from app.utils.shared_cache import shared_cache
+from cachetools import TTLCache
+from pydantic import TypeAdapter
+from typing import Dict, Any, List, Optional, Union, AsyncIterator, Callable
+import asyncio
+import hashlib
 import logging
+import re
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Validates a whole topic list in one pydantic-core call
+_TOPICS_ADAPTER = TypeAdapter(List[Topic])
+
+
+def _require_field(field: str) -> Callable[[Any], None]:
+    """
+    Build a validator that rejects AI responses missing a top-level field.
+    
+    Validation runs before a response is cached, so a malformed
+    generation is never stored and served again.
+    """
+    def validate(ai_response: Any) -> None:
+        if not isinstance(ai_response, dict) or field not in ai_response:
+            raise ValueError(f"AI response missing '{field}' field")
+    return validate
+
+
+# Batch API ids are opaque resource names; reject anything else before building URLs
+_BATCH_ID_RE = re.compile(r'^[A-Za-z0-9_-]+$')
+
+def _normalize_answer(text: str) -> str:
+    """
+    Fold case and whitespace for exact answer comparison.
+    
+    Punctuation is kept: in answers such as "a = b" vs "a != b" it
+    carries the meaning.
+    """
+    return " ".join(text.split()).casefold()
+
+
+def _question_key(question: str) -> str:
+    """Hash a question's normalized text into an answer-key lookup key."""
+    return hashlib.blake2b(_normalize_answer(question).encode("utf-8"), digest_size=16).hexdigest()
+
 
 class SubjectService:
     """
     Service for handling subject-related operations.
     """
     
+    # Quiz batch jobs by id; Gemini keeps batches for up to 48 hours.
+    # Records are shared through Redis so any worker can collect a job;
+    # this local copy covers single-process setups without Redis.
+    _QUIZ_BATCH_TTL = 48 * 3600
+    _quiz_batches: TTLCache = TTLCache(maxsize=1024, ttl=_QUIZ_BATCH_TTL)
+    
+    # Answer keys of generated quiz questions, so verify_answer can check a
+    # picked option's text without asking the AI. Entries are shared through
+    # Redis so every worker gives the same verdict; this local copy covers
+    # setups without Redis.
+    _QUIZ_ANSWER_TTL = 24 * 3600
+    _quiz_answers: TTLCache = TTLCache(maxsize=10000, ttl=_QUIZ_ANSWER_TTL)
+    
+    @staticmethod
+    async def remember_answers(questions: List[Dict[str, Any]]) -> None:
+        """
+        Record the answer key of generated multiple-choice questions.
+        
+        The answer key only saves AI calls later, so a malformed question
+        is skipped and no failure here ever reaches the request.
+        
+        Args:
+            questions: Quiz questions with "options" and "correct_answer"
+        """
+        for question in questions:
+            if not isinstance(question, dict):
+                continue
+            try:
+                await SubjectService._remember_answer(question)
+            except Exception as e:
+                logger.warning("Skipped quiz answer key entry: %s", e)
+    
+    @staticmethod
+    async def _remember_answer(question: Dict[str, Any]) -> None:
+        """Record the answer key of one multiple-choice question."""
+        text = question.get("question")
+        options = question.get("options")
+        letter = str(question.get("correct_answer", "")).strip()
+        if not text or not isinstance(options, dict) or letter not in options:
+            return
+        
+        # Only option texts are stored: letters depend on how one quiz ordered
+        # its options, and verify_answer never sees the options
+        texts = {key: _normalize_answer(str(value)) for key, value in options.items()}
+        correct = texts.pop(letter)
+        others = set(texts.values())
+        entry = {
+            "correct_answer": str(options[letter]),
+            # An option text shared with another option can't decide the answer
+            "accepted": [] if correct in others else [correct],
+            "rejected": sorted(others - {correct})
+        }
+        
+        key = _question_key(text)
+        existing = await SubjectService._load_answer_key(key)
+        if existing is not None and existing != entry:
+            # Another quiz asked the same question with a different answer
+            # key; leave that question to the AI from now on
+            entry = {"conflict": True}
+        SubjectService._quiz_answers[key] = entry
+        await shared_cache.set(f"quiz:answer:{key}", entry, ttl=SubjectService._QUIZ_ANSWER_TTL)
+    
+    @staticmethod
+    async def _load_answer_key(key: str) -> Optional[Dict[str, Any]]:
+        """Return a question's answer key entry, preferring the shared copy."""
+        entry = await shared_cache.get(f"quiz:answer:{key}")
+        if entry is None:
+            entry = SubjectService._quiz_answers.get(key)
+        return entry
+    
     @staticmethod
     async def generate_content(subject: str) -> GenerateResponse:
         """
@@ -34,36 +146,26 @@ class SubjectService:
             Exception: If generation fails
         """
         try:
-            logger.info(f"Generating content for subject: {subject}")
+            logger.info("Generating content for subject: %s", subject)
             
             # Build the prompt
             prompt = prompt_builder.build_topics_and_questions_prompt(subject)
             
             # Get AI-generated content
-            ai_response = await ai_client.generate_structured_json(prompt)
-            
-            # Validate response structure
-            if "topics" not in ai_response:
-                raise ValueError("AI response missing 'topics' field")
-            
-            # Parse topics and questions
-            topics_data = ai_response["topics"]
-            topics = []
-            total_questions = 0
-            
-            for topic_data in topics_data:
-                topic_name = topic_data.get("topic", "Unnamed Topic")
-                questions = topic_data.get("questions", [])
-                
-                # Ensure questions is a list
-                if not isinstance(questions, list):
-                    questions = []
-                
-                topics.append(Topic(
-                    topic=topic_name,
-                    questions=questions
-                ))
-                total_questions += len(questions)
+            ai_response = await prompt_cache.get_or_set(
+                prompt,
+                lambda: get_caching_client().generate_structured_json(
+                    prompt,
+                    namespace="generate_content",
+                    validate=_require_field("topics"),
+                    semantic_text=subject
+                ),
+                fold=True
+            )
+            
+            # Parse topics and questions (the Topic schema supplies defaults)
+            topics = _TOPICS_ADAPTER.validate_python(ai_response["topics"])
+            total_questions = sum(len(topic.questions) for topic in topics)
             
             # Create response
             response = GenerateResponse(
@@ -74,16 +176,42 @@ class SubjectService:
             )
             
             logger.info(
-                f"Successfully generated {len(topics)} topics "
-                f"with {total_questions} questions for {subject}"
+                "Successfully generated %d topics with %d questions for %s",
+                len(topics), total_questions, subject
             )
             
             return response
             
         except Exception as e:
-            logger.error(f"Error generating content for {subject}: {str(e)}")
+            logger.error("Error generating content for %s: %s", subject, e)
             raise Exception(f"Content generation failed: {str(e)}")
     
+    @staticmethod
+    async def generate_many(subjects: List[str]) -> List[Union[GenerateResponse, Exception]]:
+        """
+        Generate topics and questions for several subjects concurrently.
+        
+        Args:
+            subjects: Subject names
+            
+        Returns:
+            list: One entry per subject, in order; either its GenerateResponse
+                or the exception that made it fail
+        """
+        logger.info("Generating content for %d subjects", len(subjects))
+        
+        # Bound how many calls a single batch can have in flight
+        semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+        
+        async def generate_one(subject: str) -> GenerateResponse:
+            async with semaphore:
+                return await SubjectService.generate_content(subject)
+        
+        return await asyncio.gather(
+            *(generate_one(subject) for subject in subjects),
+            return_exceptions=True
+        )
+    
     @staticmethod
     async def generate_topic_questions(
         subject: str,
@@ -102,17 +230,22 @@ class SubjectService:
             dict: Questions data
         """
         try:
-            logger.info(f"Generating {count} questions for {subject} - {topic}")
+            logger.info("Generating %d questions for %s - %s", count, subject, topic)
             
             # Build prompt
             prompt = prompt_builder.build_questions_prompt(subject, topic, count)
             
             # Get AI response
-            ai_response = await ai_client.generate_structured_json(prompt)
-            
-            # Validate and return
-            if "questions" not in ai_response:
-                raise ValueError("AI response missing 'questions' field")
+            ai_response = await prompt_cache.get_or_set(
+                prompt,
+                lambda: get_caching_client().generate_structured_json(
+                    prompt,
+                    namespace=f"generate_topic_questions:{count}",
+                    validate=_require_field("questions"),
+                    semantic_text=f"{subject}: {topic}"
+                ),
+                fold=True
+            )
             
             return {
                 "subject": subject,
@@ -121,13 +254,90 @@ class SubjectService:
             }
             
         except Exception as e:
-            logger.error(f"Error generating questions: {str(e)}")
+            logger.error("Error generating questions: %s", e)
+            raise Exception(f"Question generation failed: {str(e)}")
+    
+    @staticmethod
+    async def generate_questions_multi(
+        subject: str,
+        topics: List[str],
+        count: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Generate questions for several topics of a subject with one AI call.
+        
+        Args:
+            subject: The subject name
+            topics: Topic names within the subject
+            count: Number of questions per topic
+            
+        Returns:
+            dict: Subject and one {"topic", "questions"} entry per requested topic
+        """
+        try:
+            # Drop repeated topics but keep the caller's order
+            topics = list(dict.fromkeys(topics))
+            logger.info(
+                "Generating %d questions each for %d topics of %s",
+                count, len(topics), subject
+            )
+            
+            # Build one prompt covering every topic
+            prompt = prompt_builder.build_multi_topic_questions_prompt(subject, tuple(topics), count)
+            
+            # Get AI response
+            ai_response = await prompt_cache.get_or_set(
+                prompt,
+                lambda: get_caching_client().generate_structured_json(
+                    prompt,
+                    namespace=f"generate_questions_multi:{count}",
+                    validate=_require_field("results"),
+                    semantic_text=f"{subject}: {', '.join(topics)}"
+                ),
+                fold=True
+            )
+            
+            # Demultiplex by topic name, tolerating case and whitespace drift
+            by_topic = {}
+            for entry in ai_response["results"]:
+                if isinstance(entry, dict) and isinstance(entry.get("questions"), list):
+                    by_topic.setdefault(str(entry.get("topic", "")).strip().casefold(), entry["questions"])
+            
+            questions_by_topic = {
+                topic: by_topic.get(topic.strip().casefold()) for topic in topics
+            }
+            
+            # Fall back to single-topic calls for anything the model left out
+            missing = [topic for topic, questions in questions_by_topic.items() if questions is None]
+            if missing:
+                logger.warning(
+                    "Multi-topic response missed %d topics, fetching separately",
+                    len(missing)
+                )
+                fallbacks = await asyncio.gather(*(
+                    SubjectService.generate_topic_questions(subject, topic, count)
+                    for topic in missing
+                ))
+                for fallback in fallbacks:
+                    questions_by_topic[fallback["topic"]] = fallback["questions"]
+            
+            return {
+                "subject": subject,
+                "results": [
+                    {"topic": topic, "questions": questions_by_topic[topic]}
+                    for topic in topics
+                ]
+            }
+            
+        except Exception as e:
+            logger.error("Error generating multi-topic questions: %s", e)
             raise Exception(f"Question generation failed: {str(e)}")
     
     @staticmethod
     async def generate_quiz(
         topic: str,
-        count: int = 40
+        count: int = 40,
+        mode: str = "sync"
     ) -> Dict[str, Any]:
         """
         Generate a quiz with multiple choice questions.
@@ -135,23 +345,35 @@ class SubjectService:
         Args:
             topic: Quiz topic
             count: Number of questions (default 40)
+            mode: "sync" to wait for the quiz, or "batch" to submit a
+                discounted Batch API job and return its id immediately
             
         Returns:
-            dict: Quiz data with questions and answers
+            dict: Quiz data with questions and answers, or the batch job
+                details when mode is "batch"
         """
+        if mode == "batch":
+            return await SubjectService.submit_quiz_batch(topic, count)
+        
         try:
-            logger.info(f"Generating {count} quiz questions for {topic}")
+            logger.info("Generating %d quiz questions for %s", count, topic)
             
             # Build prompt
             prompt = prompt_builder.build_quiz_generation_prompt(topic, count)
             
             # Get AI response
-            ai_response = await ai_client.generate_structured_json(prompt)
-            
-            # Validate and return
-            if "questions" not in ai_response:
-                raise ValueError("AI response missing 'questions' field")
+            ai_response = await prompt_cache.get_or_set(
+                prompt,
+                lambda: get_caching_client().generate_structured_json(
+                    prompt,
+                    namespace=f"generate_quiz:{count}",
+                    validate=_require_field("questions"),
+                    semantic_text=topic
+                ),
+                fold=True
+            )
             
+            await SubjectService.remember_answers(ai_response["questions"])
             return {
                 "topic": topic,
                 "total_questions": len(ai_response["questions"]),
@@ -159,8 +381,159 @@ class SubjectService:
             }
             
         except Exception as e:
-            logger.error(f"Error generating quiz: {str(e)}")
+            logger.error("Error generating quiz: %s", e)
+            raise Exception(f"Quiz generation failed: {str(e)}")
+    
+    @staticmethod
+    async def stream_quiz(
+        topic: str,
+        count: int = 40
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate a quiz, yielding each question as soon as it is written.
+        
+        Args:
+            topic: Quiz topic
+            count: Number of questions (default 40)
+            
+        Yields:
+            dict: One quiz question at a time
+        """
+        logger.info("Streaming %d quiz questions for %s", count, topic)
+        
+        # Build prompt
+        prompt = prompt_builder.build_quiz_generation_prompt(topic, count)
+        
+        streamed = 0
+        try:
+            async for question in get_ai_client().stream_structured_json(prompt):
+                streamed += 1
+                await SubjectService.remember_answers([question])
+                yield question
+        except Exception as e:
+            logger.error("Error streaming quiz after %d questions: %s", streamed, e)
             raise Exception(f"Quiz generation failed: {str(e)}")
+        
+        logger.info("Streamed %d quiz questions for %s", streamed, topic)
+    
+    @staticmethod
+    async def _save_quiz_batch(batch_id: str, job: Dict[str, Any]) -> None:
+        """Store a quiz batch record locally and in the shared cache."""
+        SubjectService._quiz_batches[batch_id] = job
+        await shared_cache.set(f"quiz:batch:{batch_id}", job, ttl=SubjectService._QUIZ_BATCH_TTL)
+    
+    @staticmethod
+    async def _load_quiz_batch(batch_id: str) -> Optional[Dict[str, Any]]:
+        """Return a quiz batch record, preferring the shared copy."""
+        job = await shared_cache.get(f"quiz:batch:{batch_id}")
+        if job is None:
+            job = SubjectService._quiz_batches.get(batch_id)
+        return job
+    
+    @staticmethod
+    async def submit_quiz_batch(topic: str, count: int) -> Dict[str, Any]:
+        """
+        Submit quiz generation as a Gemini Batch API job.
+        
+        The quiz is split into chunks of QUIZ_BATCH_CHUNK_SIZE questions,
+        one batch request each, and merged when the job is collected.
+        
+        Args:
+            topic: Quiz topic
+            count: Total number of questions
+            
+        Returns:
+            dict: Batch id, status and requested quiz details
+        """
+        try:
+            logger.info("Submitting batch quiz job: %d questions for %s", count, topic)
+            
+            chunk_size = settings.QUIZ_BATCH_CHUNK_SIZE
+            sizes = [min(chunk_size, count - start) for start in range(0, count, chunk_size)]
+            prompts = [
+                prompt_builder.build_quiz_generation_prompt(topic, size)
+                for size in sizes
+            ]
+            if len(prompts) > 1:
+                # Steer each chunk elsewhere so the parts don't repeat each other
+                prompts = [
+                    f"{prompt}\n\nThis is part {index} of {len(prompts)} of a larger quiz. "
+                    f"Focus part {index} on a different area of the topic than the other parts."
+                    for index, prompt in enumerate(prompts, start=1)
+                ]
+            
+            job_id = await get_ai_client().submit_batch(
+                prompts,
+                response_mime_type="application/json",
+                display_name=f"quiz: {topic}"[:128]
+            )
+            batch_id = job_id.rsplit("/", 1)[-1]
+            await SubjectService._save_quiz_batch(batch_id, {
+                "job_id": job_id,
+                "topic": topic,
+                "count": count,
+                "result": None
+            })
+            
+            return {
+                "batch_id": batch_id,
+                "status": "PENDING",
+                "topic": topic,
+                "requested_questions": count
+            }
+            
+        except Exception as e:
+            logger.error("Error submitting quiz batch: %s", e)
+            raise Exception(f"Quiz batch submission failed: {str(e)}")
+    
+    @staticmethod
+    async def get_quiz_batch(batch_id: str) -> Dict[str, Any]:
+        """
+        Check a quiz batch job, collecting the quiz once it has finished.
+        
+        Args:
+            batch_id: Id returned by submit_quiz_batch()
+            
+        Returns:
+            dict: Batch status, plus the quiz under "result" once it succeeded
+        """
+        job = await SubjectService._load_quiz_batch(batch_id) if _BATCH_ID_RE.match(batch_id) else None
+        if job is None:
+            raise Exception(f"Quiz batch not found: {batch_id}")
+        
+        if job["result"] is not None:
+            return {"batch_id": batch_id, "status": "SUCCEEDED", "result": job["result"]}
+        
+        try:
+            client = get_ai_client()
+            status = await client.poll_batch(job["job_id"])
+            if status["state"] != "SUCCEEDED":
+                return {"batch_id": batch_id, "status": status["state"], "result": None}
+            
+            # Merge the chunks, dropping questions repeated across them
+            questions = []
+            seen = set()
+            for text in await client.fetch_batch_results(job["job_id"], status):
+                for question in client.parse_json(text).get("questions", []):
+                    key = str(question.get("question", "")).strip().lower()
+                    if key not in seen:
+                        seen.add(key)
+                        questions.append(question)
+            questions = questions[:job["count"]]
+            await SubjectService.remember_answers(questions)
+            
+            job["result"] = {
+                "topic": job["topic"],
+                "total_questions": len(questions),
+                "questions": questions
+            }
+            await SubjectService._save_quiz_batch(batch_id, job)
+            logger.info("Collected batch quiz %s with %d questions", batch_id, len(questions))
+            return {"batch_id": batch_id, "status": "SUCCEEDED", "result": job["result"]}
+            
+        except Exception as e:
+            logger.error("Error collecting quiz batch: %s", e)
+            raise Exception(f"Quiz batch retrieval failed: {str(e)}")
     
     @staticmethod
     async def answer_doubt(
@@ -178,17 +551,22 @@ class SubjectService:
             dict: Answer with key points and video suggestions
         """
         try:
-            logger.info(f"Answering doubt: {question[:50]}...")
+            logger.info("Answering doubt: %s...", question[:50])
             
             # Build prompt
             prompt = prompt_builder.build_doubt_answer_prompt(question, context)
             
-            # Get AI response
-            ai_response = await ai_client.generate_structured_json(prompt)
-            
-            # Validate and return
-            if "answer" not in ai_response:
-                raise ValueError("AI response missing 'answer' field")
+            # Get AI response (exact key: case and indentation in a free-form
+            # doubt, e.g. code or "List vs list", change its meaning)
+            ai_response = await prompt_cache.get_or_set(
+                prompt,
+                lambda: get_caching_client().generate_structured_json(
+                    prompt,
+                    namespace="answer_doubt",
+                    validate=_require_field("answer"),
+                    semantic_text=f"{context}: {question}" if context else question
+                )
+            )
             
             return {
                 "question": question,
@@ -198,7 +576,7 @@ class SubjectService:
             }
             
         except Exception as e:
-            logger.error(f"Error answering doubt: {str(e)}")
+            logger.error("Error answering doubt: %s", e)
             raise Exception(f"Doubt answering failed: {str(e)}")
     
     @staticmethod
@@ -209,6 +587,9 @@ class SubjectService:
         """
         Verify if a student's answer is correct using AI.
         
+        Empty answers, and answers to generated quiz questions that repeat
+        the text of one of the options, are decided locally without an AI call.
+        
         Args:
             question: The question being answered
             answer: The student's answer
@@ -216,18 +597,49 @@ class SubjectService:
         Returns:
             dict: Verification result with is_correct and feedback
         """
+        if not answer.strip():
+            return {
+                "question": question,
+                "answer": answer,
+                "is_correct": False,
+                "feedback": "No answer was given",
+                "correct_answer": ""
+            }
+        
+        normalized = _normalize_answer(answer)
+        key = await SubjectService._load_answer_key(_question_key(question))
+        decidable = key is not None and not key.get("conflict")
+        if decidable and (normalized in key["accepted"] or normalized in key["rejected"]):
+            is_correct = normalized in key["accepted"]
+            logger.info("Verified answer from quiz answer key (correct=%s)", is_correct)
+            feedback = "Exact match" if is_correct else (
+                f"Incorrect. The correct answer is {key['correct_answer']}"
+            )
+            return {
+                "question": question,
+                "answer": answer,
+                "is_correct": is_correct,
+                "feedback": feedback,
+                "correct_answer": key["correct_answer"]
+            }
+        
         try:
-            logger.info(f"Verifying answer for: {question[:50]}...")
+            logger.info("Verifying answer for: %s...", question[:50])
             
             # Build prompt for verification
             prompt = prompt_builder.build_answer_verification_prompt(question, answer)
             
-            # Get AI response
-            ai_response = await ai_client.generate_structured_json(prompt)
-            
-            # Validate and return
-            if "is_correct" not in ai_response:
-                raise ValueError("AI response missing 'is_correct' field")
+            # Get AI response (no semantic lookup: near-identical answers
+            # can still differ in correctness)
+            ai_response = await prompt_cache.get_or_set(
+                prompt,
+                lambda: get_caching_client().generate_structured_json(
+                    prompt,
+                    temperature=settings.GEMINI_VERIFY_TEMPERATURE,
+                    namespace="verify_answer",
+                    validate=_require_field("is_correct")
+                )
+            )
             
             return {
                 "question": question,
@@ -238,7 +650,7 @@ class SubjectService:
             }
             
         except Exception as e:
-            logger.error(f"Error verifying answer: {str(e)}")
+            logger.error("Error verifying answer: %s", e)
             raise Exception(f"Answer verification failed: {str(e)}")
 
 
@@ -3,5 +3,8 @@ Utilities module for helper functions.
 """
 
 from .response_helper import response_helper
+from .prompt_cache import prompt_cache
+from .shared_cache import shared_cache
+from .response_cache import response_cache
 
-__all__ = ['response_helper']
+__all__ = ['response_helper', 'prompt_cache', 'shared_cache', 'response_cache']
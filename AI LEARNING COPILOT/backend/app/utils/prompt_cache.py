@@ -0,0 +1,117 @@
+"""
+Prompt Cache
+Exact-match response cache keyed by a hash of the full prompt.
+Checked before the semantic cache so repeated requests skip embedding too.
+Backed by the shared Redis cache, when configured, so workers share hits.
+"""
+
+from app.config import settings
+from app.utils.shared_cache import shared_cache
+from cachetools import TTLCache
+from typing import Any, Awaitable, Callable, Dict, List
+import asyncio
+import hashlib
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class PromptCache:
+    """
+    TTL cache of AI responses with per-key single-flight.
+    """
+    
+    def __init__(self, max_entries: int = 1024, ttl: int = 3600):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of cached responses
+            ttl: Seconds an entry stays valid
+        """
+        self._entries: TTLCache = TTLCache(maxsize=max_entries, ttl=ttl)
+        # key -> (lock, number of callers holding or waiting on it)
+        self._locks: Dict[str, List[Any]] = {}
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "shared_hits": 0}
+    
+    @staticmethod
+    def make_key(prompt: str, fold: bool = False) -> str:
+        """
+        Hash a prompt into a cache key.
+        
+        Args:
+            prompt: Full prompt text
+            fold: Ignore case and whitespace differences, so "python" and
+                " Python " share one entry
+        
+        Returns:
+            str: 128-bit BLAKE2b hex digest
+        """
+        if fold:
+            prompt = " ".join(prompt.split()).casefold()
+        return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+    
+    async def get_or_set(
+        self,
+        prompt: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        fold: bool = False
+    ) -> Any:
+        """
+        Return the cached response for a prompt, computing it on a miss.
+        
+        Concurrent callers with the same prompt wait on one lock, so only
+        the first one calls the factory and the rest read its result.
+        
+        Args:
+            prompt: Full prompt text
+            coro_factory: Zero-argument callable returning the awaitable to run on a miss
+            fold: Match prompts regardless of case and whitespace; leave off
+                where those carry meaning (e.g. code in an answer)
+        
+        Returns:
+            The cached or freshly computed response
+        """
+        key = self.make_key(prompt, fold)
+        value = self._entries.get(key)
+        if value is not None:
+            self.stats["hits"] += 1
+            return value
+        
+        slot = self._locks.setdefault(key, [asyncio.Lock(), 0])
+        slot[1] += 1
+        lock = slot[0]
+        try:
+            async with lock:
+                # Another caller may have filled the entry while we waited
+                value = self._entries.get(key)
+                if value is not None:
+                    self.stats["hits"] += 1
+                    return value
+                
+                # Another worker may already have answered this prompt
+                shared_key = f"llm:exact:{key}"
+                value = await shared_cache.get(shared_key)
+                if value is not None:
+                    self.stats["shared_hits"] += 1
+                    self._entries[key] = value
+                    return value
+                
+                self.stats["misses"] += 1
+                value = await coro_factory()
+                self._entries[key] = value
+                await shared_cache.set(shared_key, value)
+                return value
+        finally:
+            # Drop the lock once nobody else is queued on it
+            slot[1] -= 1
+            if slot[1] == 0:
+                del self._locks[key]
+
+
+# Create global cache instance
+prompt_cache = PromptCache(
+    max_entries=settings.PROMPT_CACHE_MAX_ENTRIES,
+    ttl=settings.PROMPT_CACHE_TTL
+)
@@ -0,0 +1,82 @@
+"""
+Response Cache
+Keeps serialized JSON bodies of pass-through endpoints, so a repeated request
+is answered without calling the service or re-encoding the response.
+"""
+
+from app.config import settings
+from cachetools import TTLCache
+from fastapi import Response
+from typing import Any, Dict, Optional
+import hashlib
+import orjson
+
+
+class ResponseCache:
+    """
+    TTL cache of ready-to-send JSON response bodies.
+    """
+    
+    def __init__(self, max_entries: int = 1024, ttl: int = 3600):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of cached bodies
+            ttl: Seconds an entry stays valid
+        """
+        self._entries: TTLCache = TTLCache(maxsize=max_entries, ttl=ttl)
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+    
+    @staticmethod
+    def make_key(route: str, *params: Any) -> str:
+        """
+        Hash a route and its parameters into a cache key.
+        
+        Args:
+            route: Endpoint name
+            *params: Request parameters that determine the response
+        
+        Returns:
+            str: 128-bit BLAKE2b hex digest
+        """
+        return hashlib.blake2b(orjson.dumps([route, *params]), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[Response]:
+        """
+        Return the cached response for a key.
+        
+        Args:
+            key: Key from make_key()
+        
+        Returns:
+            Response: Response carrying the stored bytes, or None on a miss
+        """
+        body = self._entries.get(key)
+        if body is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return Response(content=body, media_type="application/json")
+    
+    def set(self, key: str, content: Dict[str, Any]) -> Response:
+        """
+        Serialize a response body once, store it and return it as a response.
+        
+        Args:
+            key: Key from make_key()
+            content: JSON-serializable response body
+        
+        Returns:
+            Response: Response carrying the serialized body
+        """
+        body = orjson.dumps(content)
+        self._entries[key] = body
+        return Response(content=body, media_type="application/json")
+
+
+# Create global cache instance
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl=settings.RESPONSE_CACHE_TTL
+)
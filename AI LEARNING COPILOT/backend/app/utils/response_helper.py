@@ -7,9 +7,17 @@ from fastapi import HTTPException
 from app.models.schemas import ErrorResponse
 from typing import Dict, Any
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Error message patterns mapped to HTTP status codes, checked in order
+_STATUS_TABLE = [
+    (re.compile(r"not found", re.IGNORECASE), 404),
+    (re.compile(r"invalid|validation", re.IGNORECASE), 400),
+    (re.compile(r"unauthorized|api key", re.IGNORECASE), 401),
+]
+
 
 class ResponseHelper:
     """
@@ -53,7 +61,7 @@ class ResponseHelper:
         Returns:
             HTTPException: Formatted error exception
         """
-        logger.error(f"{error_type}: {message}")
+        logger.error("%s: %s", error_type, message)
         
         return HTTPException(
             status_code=status_code,
@@ -79,14 +87,11 @@ class ResponseHelper:
         error_message = str(e)
         
         # Determine status code based on error type
-        if "not found" in error_message.lower():
-            status_code = 404
-        elif "invalid" in error_message.lower() or "validation" in error_message.lower():
-            status_code = 400
-        elif "unauthorized" in error_message.lower() or "api key" in error_message.lower():
-            status_code = 401
-        else:
-            status_code = 500
+        status_code = 500
+        for pattern, code in _STATUS_TABLE:
+            if pattern.search(error_message):
+                status_code = code
+                break
         
         return ResponseHelper.error_response(
             error_type=f"{operation}Error",
@@ -0,0 +1,144 @@
+"""
+Shared Cache
+Optional Redis store that lets every worker process reuse cached AI responses.
+Disabled unless REDIS_URL is set and the redis package is installed.
+"""
+
+from app.config import settings
+from typing import Any, List, Optional
+import gzip
+import logging
+import orjson
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class SharedCache:
+    """
+    Redis-backed cache of JSON values, stored gzip-compressed.
+    
+    Every operation degrades to a miss or a no-op when Redis is not
+    configured or unreachable; a cache outage never fails a request.
+    """
+    
+    def __init__(self, url: Optional[str] = None, ttl: int = 3600):
+        """
+        Initialize the cache (no connection is made until connect()).
+        
+        Args:
+            url: Redis connection URL, or None to disable the cache
+            ttl: Default seconds an entry stays valid
+        """
+        self.url = url
+        self.ttl = ttl
+        self._redis = None
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether a Redis connection is available."""
+        return self._redis is not None
+    
+    async def connect(self) -> None:
+        """Open the Redis connection pool, if a URL is configured."""
+        if not self.url or self._redis is not None:
+            return
+        
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            logger.warning("redis is not installed, shared cache disabled")
+            return
+        
+        client = redis.from_url(self.url, max_connections=settings.REDIS_MAX_CONNECTIONS)
+        try:
+            await client.ping()
+        except Exception as e:
+            logger.warning("Redis unreachable, shared cache disabled: %s", e)
+            await client.aclose()
+            return
+        
+        self._redis = client
+        logger.info("🗄️ Shared cache connected to Redis")
+    
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+    
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        """Serialize and compress a JSON value."""
+        return gzip.compress(orjson.dumps(value), compresslevel=6)
+    
+    @staticmethod
+    def _decode(raw: bytes) -> Any:
+        """Decompress and parse a stored JSON value."""
+        return orjson.loads(gzip.decompress(raw))
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a value.
+        
+        Args:
+            key: Redis key
+        
+        Returns:
+            The stored value, or None on a miss or when disabled
+        """
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(key)
+            return None if raw is None else self._decode(raw)
+        except Exception as e:
+            logger.warning("Shared cache read failed: %s", e)
+            return None
+    
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Store a value with an expiry.
+        
+        Args:
+            key: Redis key
+            value: JSON-serializable value
+            ttl: Seconds to keep it (defaults to the cache TTL)
+        """
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(key, self._encode(value), ex=ttl or self.ttl)
+        except Exception as e:
+            logger.warning("Shared cache write failed: %s", e)
+    
+    async def values_by_prefix(self, prefix: str, limit: int) -> List[Any]:
+        """
+        Load the values of keys that start with a prefix.
+        
+        Args:
+            prefix: Key prefix (e.g. "llm:semantic:")
+            limit: Maximum number of values to load
+        
+        Returns:
+            list: Up to limit stored values, in no particular order
+        """
+        if self._redis is None or limit <= 0:
+            return []
+        keys = []
+        try:
+            async for key in self._redis.scan_iter(match=f"{prefix}*"):
+                keys.append(key)
+                if len(keys) >= limit:
+                    break
+            if not keys:
+                return []
+            # Keys can expire between the scan and the read
+            return [self._decode(raw) for raw in await self._redis.mget(keys) if raw is not None]
+        except Exception as e:
+            logger.warning("Shared cache load failed: %s", e)
+            return []
+
+
+# Create global cache instance
+shared_cache = SharedCache(url=settings.REDIS_URL, ttl=settings.REDIS_CACHE_TTL)
@@ -2,6 +2,7 @@
 List all available Gemini models
 """
 
+import asyncio
 import httpx
 import os
 from dotenv import load_dotenv
@@ -14,46 +15,44 @@ print("=" * 60)
 print("🔍 Fetching Available Gemini Models")
 print("=" * 60)
 
-# Try v1 API
-print("\n📡 Checking v1 API...")
-url_v1 = f"https://generativelanguage.googleapis.com/v1/models?key={API_KEY}"
-
-try:
-    response = httpx.get(url_v1, timeout=30.0)
-    if response.status_code == 200:
-        data = response.json()
-        print(f"\n✅ Found {len(data.get('models', []))} models in v1 API:\n")
-        for model in data.get('models', []):
-            name = model.get('name', '').replace('models/', '')
-            supported = model.get('supportedGenerationMethods', [])
-            if 'generateContent' in supported:
-                print(f"  ✅ {name} (supports generateContent)")
-            else:
-                print(f"  ⚠️ {name} (methods: {', '.join(supported)})")
-    else:
-        print(f"❌ v1 API failed: {response.status_code}")
-except Exception as e:
-    print(f"❌ Error with v1 API: {str(e)}")
-
-# Try v1beta API  
-print("\n📡 Checking v1beta API...")
-url_v1beta = f"https://generativelanguage.googleapis.com/v1beta/models?key={API_KEY}"
-
-try:
-    response = httpx.get(url_v1beta, timeout=30.0)
-    if response.status_code == 200:
-        data = response.json()
-        print(f"\n✅ Found {len(data.get('models', []))} models in v1beta API:\n")
-        for model in data.get('models', []):
-            name = model.get('name', '').replace('models/', '')
-            supported = model.get('supportedGenerationMethods', [])
-            if 'generateContent' in supported:
-                print(f"  ✅ {name} (supports generateContent)")
-            else:
-                print(f"  ⚠️  {name} (methods: {', '.join(supported)})")
-    else:
-        print(f"❌ v1beta API failed: {response.status_code}")
-except Exception as e:
-    print(f"❌ Error with v1beta API: {str(e)}")
-
-print("\n" + "=" * 60)
+BASE_URL = "https://generativelanguage.googleapis.com"
+API_VERSIONS = ["v1", "v1beta"]
+
+
+def print_models(version, result):
+    """Print the models one API version returned (or why the request failed)."""
+    print(f"\n📡 Checking {version} API...")
+    
+    if isinstance(result, Exception):
+        print(f"❌ Error with {version} API: {str(result)}")
+        return
+    if result.status_code != 200:
+        print(f"❌ {version} API failed: {result.status_code}")
+        return
+    
+    data = result.json()
+    print(f"\n✅ Found {len(data.get('models', []))} models in {version} API:\n")
+    for model in data.get('models', []):
+        name = model.get('name', '').replace('models/', '')
+        supported = model.get('supportedGenerationMethods', [])
+        if 'generateContent' in supported:
+            print(f"  ✅ {name} (supports generateContent)")
+        else:
+            print(f"  ⚠️ {name} (methods: {', '.join(supported)})")
+
+
+async def main():
+    # Query every API version at once over one pooled HTTP/2 client
+    async with httpx.AsyncClient(http2=True, timeout=30.0) as client:
+        results = await asyncio.gather(
+            *(client.get(f"{BASE_URL}/{version}/models?key={API_KEY}") for version in API_VERSIONS),
+            return_exceptions=True
+        )
+    
+    for version, result in zip(API_VERSIONS, results):
+        print_models(version, result)
+    
+    print("\n" + "=" * 60)
+
+
+asyncio.run(main())
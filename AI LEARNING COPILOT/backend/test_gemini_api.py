@@ -4,7 +4,7 @@ Tests the Google Gemini API connection independently
 """
 
 import httpx
-import json
+import orjson
 import os
 from dotenv import load_dotenv
 
@@ -48,14 +48,15 @@ print(f"📡 URL: https://generativelanguage.googleapis.com/v1/models/{MODEL_NAM
 print()
 
 try:
-    # Make the request
-    response = httpx.post(url, json=payload, timeout=30.0)
+    # Make the request over a pooled HTTP/2 client
+    with httpx.Client(http2=True, timeout=30.0) as client:
+        response = client.post(url, json=payload)
     
     print(f"📊 Response Status: {response.status_code}")
     print()
     
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content)
         
         # Extract text from response
         if "candidates" in data and len(data["candidates"]) > 0:
@@ -70,10 +71,10 @@ try:
                 print("=" * 60)
             else:
                 print("⚠️ Unexpected response structure")
-                print(json.dumps(data, indent=2))
+                print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
         else:
             print("⚠️ No candidates in response")
-            print(json.dumps(data, indent=2))
+            print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
     else:
         print("❌ API Request Failed!")
         print(f"Status Code: {response.status_code}")
@@ -82,7 +83,7 @@ try:
         
         # Parse error if JSON
         try:
-            error_data = response.json()
+            error_data = orjson.loads(response.content)
             if "error" in error_data:
                 error = error_data["error"]
                 print("=" * 60)
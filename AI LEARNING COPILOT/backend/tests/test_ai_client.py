@@ -0,0 +1,33 @@
+"""
+Tests for AIClient's JSON extraction from raw model output.
+"""
+
+from app.ai.ai_client import AIClient
+import pytest
+
+
+@pytest.fixture
+def client():
+    return AIClient()
+
+
+def test_parse_json_plain_object(client):
+    assert client.parse_json('{"a": 1}') == {"a": 1}
+
+
+def test_extract_json_strips_fence_and_prose(client):
+    text = 'Here you go:\n```json\n{"a": [1, 2]}\n```\nEnjoy!'
+    
+    assert client.parse_json(text) == {"a": [1, 2]}
+
+
+def test_extract_json_object_with_trailing_bracket_text(client):
+    assert client.parse_json('{"a": 1} see [2]') == {"a": 1}
+
+
+def test_extract_json_array_with_trailing_brace_text(client):
+    assert client.parse_json('Result: [1, 2] (shape {n})') == [1, 2]
+
+
+def test_extract_json_fixes_smart_quotes_and_trailing_commas(client):
+    assert client.parse_json('{“a”: [1, 2,],}') == {"a": [1, 2]}
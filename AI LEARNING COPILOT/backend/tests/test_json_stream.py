@@ -0,0 +1,112 @@
+"""
+Tests for the incremental JSON array parser.
+"""
+
+from app.ai.json_stream import JsonArrayStreamParser
+
+
+def feed_all(chunks):
+    """Feed chunks one by one and collect every item the parser emits."""
+    parser = JsonArrayStreamParser()
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    return items
+
+
+def test_items_of_object_array_field():
+    document = '{"questions": [{"q": 1}, {"q": 2}], "total": 2}'
+    
+    assert feed_all([document]) == [{"q": 1}, {"q": 2}]
+
+
+def test_bare_top_level_array():
+    document = '[{"q": 1}, {"q": 2}]'
+    
+    assert feed_all([document]) == [{"q": 1}, {"q": 2}]
+
+
+def test_tokens_split_across_chunks():
+    document = '{"questions": [{"question": "What is 2 + 2?", "options": ["3", "4"]}, {"q": true}]}'
+    
+    # Every split point, including inside strings, keys and literals
+    for size in range(1, 8):
+        chunks = [document[start:start + size] for start in range(0, len(document), size)]
+        assert feed_all(chunks) == [
+            {"question": "What is 2 + 2?", "options": ["3", "4"]},
+            {"q": True}
+        ]
+
+
+def test_item_emitted_as_soon_as_it_closes():
+    parser = JsonArrayStreamParser()
+    
+    assert parser.feed('{"questions": [{"q": 1}') == [{"q": 1}]
+    assert parser.feed(', {"q": ') == []
+    assert parser.feed('2}]}') == [{"q": 2}]
+
+
+def test_escaped_quotes_in_strings():
+    document = '{"questions": [{"q": "say \\"hi\\" {not a brace}"}, {"q": "ends with \\\\"}]}'
+    
+    assert feed_all([document[:20], document[20:41], document[41:]]) == [
+        {"q": 'say "hi" {not a brace}'},
+        {"q": "ends with \\"}
+    ]
+
+
+def test_brackets_inside_strings():
+    document = '{"questions": [{"code": "x = [1, 2]; y = {\\"a\\": [3]}"}, {"code": "]}"}]}'
+    
+    assert feed_all([document]) == [
+        {"code": 'x = [1, 2]; y = {"a": [3]}'},
+        {"code": "]}"}
+    ]
+
+
+def test_nested_values_stay_inside_their_item():
+    document = '{"questions": [{"options": [{"a": [1]}, {"b": {}}]}]}'
+    
+    assert feed_all([document]) == [{"options": [{"a": [1]}, {"b": {}}]}]
+
+
+def test_no_array_field_yields_nothing():
+    assert feed_all(['{"answer": "none"}']) == []
+
+
+def test_only_the_questions_field_is_streamed():
+    document = (
+        '{"meta": {"x": {"y": 1}}, "tags": [{"t": 1}],'
+        ' "questions": [{"q": 1}], "related": [{"r": 1}]}'
+    )
+    
+    assert feed_all([document]) == [{"q": 1}]
+
+
+def test_other_field_name():
+    document = '{"questions": [{"q": 1}], "results": [{"r": 1}]}'
+    parser = JsonArrayStreamParser(field="results")
+    
+    assert parser.feed(document) == [{"r": 1}]
+
+
+def test_key_split_across_chunks():
+    document = '{"quest": [{"x": 1}], "questions": [{"q": 1}]}'
+    
+    for size in range(1, 6):
+        chunks = [document[start:start + size] for start in range(0, len(document), size)]
+        assert feed_all(chunks) == [{"q": 1}]
+
+
+def test_scalar_items_of_questions_field():
+    document = '{"questions": ["What is a list?", 3, -4.5e1, true, null, [5]]}'
+    
+    for size in range(1, 6):
+        chunks = [document[start:start + size] for start in range(0, len(document), size)]
+        assert feed_all(chunks) == ["What is a list?", 3, -45.0, True, None, [5]]
+
+
+def test_scalar_items_of_bare_array():
+    document = '[1, "a]", {"b": [2]}, false]'
+    
+    assert feed_all([document[:5], document[5:]]) == [1, "a]", {"b": [2]}, False]
@@ -0,0 +1,51 @@
+"""
+Tests for the subject routes, called directly as coroutines.
+"""
+
+from app.services.subject_service import SubjectService
+from app.utils.prompt_cache import PromptCache
+from app.utils.response_cache import ResponseCache
+from cachetools import TTLCache
+import asyncio
+import importlib
+import orjson
+
+routes_module = importlib.import_module("app.routes.subject_routes")
+service_module = importlib.import_module("app.services.subject_service")
+
+
+class FakeCachingClient:
+    """Stands in for CachingAIClient, returning one canned quiz."""
+    
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+    
+    async def generate_structured_json(self, prompt, namespace="default", validate=None, **kwargs):
+        self.calls += 1
+        return self.response
+
+
+def test_cached_quiz_response_registers_answer_keys(monkeypatch):
+    client = FakeCachingClient({
+        "questions": [{
+            "question": "Which keyword defines a function?",
+            "options": {"A": "def", "B": "func"},
+            "correct_answer": "A"
+        }]
+    })
+    monkeypatch.setattr(service_module, "get_caching_client", lambda: client)
+    monkeypatch.setattr(service_module, "prompt_cache", PromptCache())
+    monkeypatch.setattr(routes_module, "response_cache", ResponseCache())
+    monkeypatch.setattr(SubjectService, "_quiz_answers", TTLCache(maxsize=100, ttl=60))
+    
+    first = asyncio.run(routes_module.generate_quiz("Python Functions", 1))
+    # The answer keys expire while the response is still cached
+    SubjectService._quiz_answers.clear()
+    second = asyncio.run(routes_module.generate_quiz("Python Functions", 1))
+    
+    assert client.calls == 1
+    assert second.body == first.body
+    assert orjson.loads(second.body)["data"]["total_questions"] == 1
+    verdict = asyncio.run(SubjectService.verify_answer("Which keyword defines a function?", "def"))
+    assert verdict["is_correct"] is True
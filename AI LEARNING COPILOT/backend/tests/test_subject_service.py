@@ -0,0 +1,153 @@
+"""
+Tests for SubjectService against a fake AI client.
+"""
+
+from app.services.subject_service import SubjectService
+from app.utils.prompt_cache import PromptCache
+from cachetools import TTLCache
+import asyncio
+import importlib
+import pytest
+
+# The package re-exports the service instance under the module's name
+service_module = importlib.import_module("app.services.subject_service")
+
+
+class FakeCachingClient:
+    """Stands in for CachingAIClient, returning canned responses in order."""
+    
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+    
+    async def generate_structured_json(self, prompt, namespace="default", validate=None, **kwargs):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if validate is not None:
+            validate(response)
+        return response
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """Route the service through a fake client and an empty prompt cache."""
+    def install(*responses):
+        client = FakeCachingClient(*responses)
+        monkeypatch.setattr(service_module, "get_caching_client", lambda: client)
+        monkeypatch.setattr(service_module, "prompt_cache", PromptCache())
+        monkeypatch.setattr(SubjectService, "_quiz_answers", TTLCache(maxsize=100, ttl=60))
+        return client
+    return install
+
+
+def test_generate_content_counts_topics_and_questions(fake_client):
+    fake_client({
+        "topics": [
+            {"topic": "Basics", "questions": ["What is Python?", "What is a variable?"]},
+            {"topic": "Functions", "questions": ["What does def do?"]},
+            {"questions": "not a list"}
+        ]
+    })
+    
+    response = asyncio.run(SubjectService.generate_content("Python"))
+    
+    assert response.subject == "Python"
+    assert [topic.topic for topic in response.topics] == ["Basics", "Functions", "Unnamed Topic"]
+    assert response.total_topics == 3
+    assert response.total_questions == 3
+
+
+def test_generate_content_reuses_cached_response(fake_client):
+    client = fake_client({"topics": [{"topic": "Basics", "questions": ["What is Python?"]}]})
+    
+    first = asyncio.run(SubjectService.generate_content("Python"))
+    second = asyncio.run(SubjectService.generate_content("PYTHON"))
+    
+    assert client.calls == 1
+    assert second.total_questions == first.total_questions == 1
+
+
+def test_generate_content_does_not_cache_malformed_response(fake_client):
+    client = fake_client(
+        {"subjects": []},
+        {"topics": [{"topic": "Basics", "questions": []}]}
+    )
+    
+    with pytest.raises(Exception, match="missing 'topics'"):
+        asyncio.run(SubjectService.generate_content("Python"))
+    response = asyncio.run(SubjectService.generate_content("Python"))
+    
+    assert client.calls == 2
+    assert response.total_topics == 1
+    assert response.total_questions == 0
+
+
+def test_generate_quiz_tolerates_non_dict_questions(fake_client):
+    client = fake_client({
+        "questions": [
+            "What is a list?",
+            {
+                "question": "Which keyword defines a function?",
+                "options": {"A": "def", "B": "func"},
+                "correct_answer": "A"
+            }
+        ]
+    })
+    
+    first = asyncio.run(SubjectService.generate_quiz("Python Functions", 2))
+    second = asyncio.run(SubjectService.generate_quiz("Python Functions", 2))
+    
+    assert client.calls == 1
+    assert first["total_questions"] == second["total_questions"] == 2
+    verdict = asyncio.run(SubjectService.verify_answer("Which keyword defines a function?", "def"))
+    assert verdict["is_correct"] is True
+
+
+def quiz(question, options, correct_answer):
+    """Build a one-question quiz response."""
+    return {"questions": [{"question": question, "options": options, "correct_answer": correct_answer}]}
+
+
+def test_answer_key_ignores_option_letters(fake_client):
+    client = fake_client(
+        quiz("Which keyword defines a function?", {"A": "def", "B": "func"}, "A"),
+        {"is_correct": False, "feedback": "Checked by AI"}
+    )
+    asyncio.run(SubjectService.generate_quiz("Python Functions", 1))
+    
+    by_text = asyncio.run(SubjectService.verify_answer("Which keyword defines a function?", "FUNC"))
+    by_letter = asyncio.run(SubjectService.verify_answer("Which keyword defines a function?", "A"))
+    
+    assert by_text["is_correct"] is False
+    assert by_text["correct_answer"] == "def"
+    # Letters depend on the quiz's option order, so the AI decides them
+    assert by_letter["feedback"] == "Checked by AI"
+    assert client.calls == 2
+
+
+def test_reordered_options_keep_the_answer_key(fake_client):
+    fake_client(
+        quiz("Which keyword defines a function?", {"A": "def", "B": "func"}, "A"),
+        quiz("Which keyword defines a function?", {"A": "func", "B": "def"}, "B")
+    )
+    asyncio.run(SubjectService.generate_quiz("Python Functions", 1))
+    asyncio.run(SubjectService.generate_quiz("Python Basics", 1))
+    
+    verdict = asyncio.run(SubjectService.verify_answer("Which keyword defines a function?", "def"))
+    
+    assert verdict["is_correct"] is True
+
+
+def test_conflicting_answer_keys_fall_back_to_the_ai(fake_client):
+    client = fake_client(
+        quiz("Which is larger?", {"A": "1", "B": "2"}, "B"),
+        quiz("Which is larger?", {"A": "1", "B": "2"}, "A"),
+        {"is_correct": True, "feedback": "Checked by AI"}
+    )
+    asyncio.run(SubjectService.generate_quiz("Numbers", 1))
+    asyncio.run(SubjectService.generate_quiz("Counting", 1))
+    
+    verdict = asyncio.run(SubjectService.verify_answer("Which is larger?", "2"))
+    
+    assert verdict["feedback"] == "Checked by AI"
+    assert client.calls == 3
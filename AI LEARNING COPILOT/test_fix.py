@@ -5,7 +5,7 @@ import asyncio
 import sys
 sys.path.insert(0, 'e:/codecoreaisys/backend')
 
-from app.ai.ai_client import ai_client
+from app.ai.ai_client import get_ai_client
 
 async def test():
     try:
@@ -13,7 +13,7 @@ async def test():
         from app.ai.prompt_builder import prompt_builder
         
         prompt = prompt_builder.build_topics_and_questions_prompt("Python")
-        result = await ai_client.generate_structured_json(prompt)
+        result = await get_ai_client().generate_structured_json(prompt)
         
         print(f"\n✅ SUCCESS!")
         print(f"Generated {len(result.get('topics', []))} topics")
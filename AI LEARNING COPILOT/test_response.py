@@ -5,7 +5,7 @@ import asyncio
 import sys
 sys.path.insert(0, 'e:/codecoreaisys/backend')
 
-from app.ai.ai_client import ai_client
+from app.ai.ai_client import get_ai_client
 
 async def test():
     try:
@@ -15,7 +15,7 @@ async def test():
         prompt = 'Generate a JSON object with topics about Python. Format: {"topics": [{"topic": "name", "questions": ["q1", "q2"]}]}'
         
         # Get raw completion
-        raw_response = await ai_client.generate_completion(prompt, max_tokens=4000)
+        raw_response = await get_ai_client().generate_completion(prompt, max_tokens=4000)
         
         print(f"\n📝 Full Response Length: {len(raw_response)} chars")
         print(f"\n{'='*60}")